@@ -0,0 +1,61 @@
+import argparse
+import configparser
+import csv
+import os
+from colorama import init, Fore
+from functions.batch import load_manifest, run_batch
+# Initialize colorama
+init(autoreset=True)
+
+COLUMNS = [
+    "name", "status", "matched_rank", "matched_align", "matched_gap", "matched_spread",
+    "fallbacks", "wall_s", "text", "timing", "output", "error",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile every text/timing pair of a manifest")
+    parser.add_argument("manifest", help="CSV or JSON list of text, timing and output files")
+    parser.add_argument("--config", default="config.ini", help="settings shared by every job")
+    parser.add_argument("--jobs", type=int, help="jobs run at the same time (overrides config)")
+    parser.add_argument("--report", help="consolidated CSV report (overrides config)")
+    args = parser.parse_args()
+
+    config = configparser.ConfigParser()
+    config.read(args.config)
+    base_sections = {section: dict(config[section]) for section in config.sections()}
+    n_jobs = args.jobs or config.getint("batch", "jobs", fallback=1)
+    report_path = args.report or config.get("batch", "report", fallback="")
+    if report_path:
+        # before the jobs run: a missing directory must not lose the report
+        os.makedirs(os.path.dirname(report_path) or ".", exist_ok=True)
+
+    jobs = load_manifest(args.manifest)
+    print(Fore.CYAN + f"▶ Reconciling {len(jobs)} jobs ({n_jobs} at a time)...")
+
+    def on_result(job, result):
+        if result["status"] == "ok":
+            print(Fore.GREEN + f"✔ {job['name']}: rank {result['matched_rank']}, gap {result['matched_gap']}, "
+                               f"spread {result['matched_spread']}, fallbacks {result['fallbacks']} "
+                               f"({result['wall_s']:.1f}s)")
+        else:
+            print(Fore.RED + f"✘ {job['name']}: {result['error']}")
+
+    results = run_batch(jobs, base_sections, n_jobs, on_result)
+
+    # ─────────────── Report ───────────────
+    rows = [{**job, **result} for job, result in zip(jobs, results)]
+    failed = sum(row["status"] != "ok" for row in rows)
+    print(Fore.CYAN + f"▶ {len(rows) - failed} done, {failed} failed, "
+                      f"{sum(row['wall_s'] for row in rows):.1f}s of reconciliation")
+
+    if report_path:
+        with open(report_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        print(Fore.GREEN + f"✔ Batch report saved to: {report_path}")
+
+
+if __name__ == "__main__":
+    main()
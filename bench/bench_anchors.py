@@ -0,0 +1,52 @@
+"""
+Runtime and anchor count of greedy vs monotonic anchor selection on
+large random candidate lists shaped like real fused ranks (mostly along
+the diagonal, some crossing outliers).
+
+    python bench/bench_anchors.py [n_cues]
+
+Optimality of the monotonic selection is checked against brute force by
+bench/check_anchors.py.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functions.select_anchors import select_anchors_greedy, select_anchors_monotonic
+
+
+def make_candidates(n_cues, seed=0):
+    rng = random.Random(seed)
+    candidates = []
+    for text_idx in range(n_cues):
+        for _ in range(rng.randint(1, 4)):
+            jitter = rng.randint(-3, 3) if rng.random() < 0.9 else rng.randint(-200, 200)
+            time_idx = min(max(text_idx + jitter, 0), n_cues - 1)
+            candidates.append((rng.choice([1.0, 1.5, 2.0, 2.5, 3.0]), text_idx, time_idx))
+    candidates.sort(key=lambda x: x[0])
+    return candidates
+
+
+def crossings(rank_matches):
+    """Anchors whose timing index goes backwards in text order"""
+    ordered = sorted(rank_matches)
+    return sum(b[1] <= a[1] for a, b in zip(ordered, ordered[1:]))
+
+
+def main():
+    n_cues = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    candidates = make_candidates(n_cues)
+    print(f"▶ {len(candidates)} candidates over {n_cues} cues")
+
+    for name, select in (("greedy", select_anchors_greedy), ("monotonic", select_anchors_monotonic)):
+        t0 = time.perf_counter()
+        rank_matches = select(candidates)
+        elapsed = time.perf_counter() - t0
+        print(f"{name:<10}: {elapsed:7.3f}s  anchors={len(rank_matches):>7}  crossings={crossings(rank_matches)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Cold-start time of the command line tools: each command is run as a new
+process on a small synthetic pair (bench/synthetic.py), so the time is
+dominated by interpreter start-up and imports, not by matching.
+
+    python bench/bench_cold_start.py [--runs 5] [--cues 200] [--out cold_start.json]
+
+Reports the median and best wall time per command, plus the modules each
+command imported that only some subcommands need (numpy, rapidfuzz,
+pysrt, process pools).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench.synthetic import write_pair
+
+# modules a cold start should only pay for when the command needs them
+HEAVY_MODULES = ("numpy", "rapidfuzz", "pysrt", "concurrent.futures.process", "tqdm", "colorama")
+
+CONFIG = """[files]
+text_source = {text}
+timing_source = {timing}
+output = {output}
+
+[matching]
+time_tolerance_ms_start = 20000
+time_tolerance_ms_end = 20000
+min_similarity = 0.4
+top_k = 8
+max_avg_rank = 3.0
+fallback_to_timing_text = true
+max_gap = 10
+
+[shift]
+shift_start_ms = -2000
+shift_end_ms = 6000
+"""
+
+
+def commands(tmp, config_path, text_path):
+    cli = os.path.join(ROOT, "cli.py")
+    out = os.path.join(tmp, "out.srt")
+    return {
+        "python (empty)": [sys.executable, "-c", "pass"],
+        "cli --help": [sys.executable, cli, "--help"],
+        "cli reindex": [sys.executable, cli, "reindex", text_path, "-o", out],
+        "cli shift": [sys.executable, cli, "shift", text_path, "-o", out, "--config", config_path],
+        "cli reconcile": [sys.executable, cli, "reconcile", "--config", config_path],
+        "main.py": [sys.executable, os.path.join(ROOT, "main.py"), "--config", config_path],
+    }
+
+
+def imported_heavy(command):
+    """Heavy modules left in sys.modules once command has run"""
+    probe = (
+        "import contextlib, io, runpy, sys\n"
+        f"sys.argv = {command[1:]!r}\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    try:\n"
+        f"        runpy.run_path({command[1]!r}, run_name='__main__')\n"
+        "    except SystemExit:\n"
+        "        pass\n"
+        f"print('heavy:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, cwd=ROOT)
+    lines = [line for line in result.stdout.splitlines() if line.startswith("heavy:")]
+    return [m for m in lines[-1][len("heavy:"):].split(",") if m] if lines else []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start time of the command line tools")
+    parser.add_argument("--runs", type=int, default=5, help="runs per command (median reported)")
+    parser.add_argument("--cues", type=int, default=200, help="cues of the synthetic pair")
+    parser.add_argument("--out", help="JSON report path")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        text_path, timing_path, _ = write_pair(tmp, args.cues, 0)
+        config_path = os.path.join(tmp, "config.ini")
+        with open(config_path, "w", encoding="utf-8") as f:
+            f.write(CONFIG.format(text=text_path, timing=timing_path, output=os.path.join(tmp, "final.srt")))
+
+        print(f"▶ {args.runs} runs per command, {args.cues} cues")
+        print(f"{'command':<16}{'median ms':>11}{'best ms':>10}  heavy imports")
+        for name, command in commands(tmp, config_path, text_path).items():
+            times = []
+            for _ in range(args.runs):
+                t0 = time.perf_counter()
+                subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+                times.append((time.perf_counter() - t0) * 1000)
+            heavy = imported_heavy(command) if len(command) > 2 and command[1] != "-c" else []
+            results[name] = {"median_ms": statistics.median(times), "best_ms": min(times), "heavy_imports": heavy}
+            print(f"{name:<16}{results[name]['median_ms']:>11.0f}{results[name]['best_ms']:>10.0f}  {', '.join(heavy) or '-'}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"runs": args.runs, "cues": args.cues, "results": results}, f, indent=2)
+        print(f"✔ Cold-start report saved to: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+End-to-end benchmark of reconcile_rank_fusion on synthetic pairs
+(bench/synthetic.py): per-stage time and peak RSS from the Profiler, and
+accuracy against the known ground truth, saved together as JSON so
+throughput and quality regressions show up in the same report.
+
+    python bench/bench_reconcile.py [--sizes 1000,5000] [--seed 0]
+                                    [--config config.ini] [--out bench.json]
+                                    [--compare previous.json] [--auto-shift]
+                                    [--memory]
+
+With --memory each case runs a second time under tracemalloc for the
+peak memory of every stage ("memory" in the report); times always come
+from the first, untraced run.
+
+Matching settings come from the [matching] section of --config. With
+--auto-shift the generator's drift is estimated (estimate_shift) instead
+of being undone with the known values, and the tolerance is narrowed.
+"""
+import argparse
+import configparser
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict, deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.synthetic import DEFAULTS, write_pair
+from functions.apply_time_shift import apply_time_shift_linear
+from functions.estimate_shift import estimate_shift
+from functions.profiler import Profiler
+from functions.reconcile_rank_fusion import reconcile_rank_fusion
+from functions.srt_stream import load_cues, read_srt
+from functions.text_store import TextStore
+
+# a cue counts as correct when its start lands this close to the truth
+CORRECT_WITHIN_MS = 500
+
+
+def matching_settings(config):
+    """[matching] / [performance] → reconcile_rank_fusion keyword arguments"""
+    matching = config["matching"]
+    return {
+        "time_tolerance_start": matching.getint("time_tolerance_ms_start"),
+        "time_tolerance_end": matching.getint("time_tolerance_ms_end"),
+        "min_similarity": matching.getfloat("min_similarity"),
+        "top_k": matching.getint("top_k"),
+        "max_avg_rank": matching.getfloat("max_avg_rank"),
+        "scorer": matching.get("scorer", fallback="difflib"),
+        "candidate_mode": matching.get("candidates", fallback="window"),
+        "lsh_num_perm": matching.getint("lsh_num_perm", fallback=64),
+        "lsh_bands": matching.getint("lsh_bands", fallback=64),
+        "scoring": matching.get("scoring", fallback="pairwise"),
+        "vector_prefilter_k": matching.getint("vector_prefilter_k", fallback=24),
+        "warp_every": matching.getint("warp_every", fallback=10),
+        "warp_margin_ms": matching.getint("warp_margin_ms", fallback=2000),
+        "warp_scorer": matching.get("warp_scorer", fallback="indel"),
+        "anchor_mode": matching.get("anchor_mode", fallback="greedy"),
+        "engine": matching.get("engine", fallback="rank_fusion"),
+        "workers": config.getint("performance", "workers", fallback=1),
+    }
+
+
+def accuracy(output_file, text_cues, truth):
+    """Start-time error of every text cue in output_file against the truth"""
+    # output items are sorted by time; find each text cue back by its text
+    positions = defaultdict(deque)
+    for idx, text in enumerate(text_cues.texts):
+        positions[text].append(idx)
+
+    errors = []
+    for start, _, text in read_srt(output_file):
+        # the cue text ends where the origin comment starts
+        text = text.split("\n{\\ O (", 1)[0]
+        if positions.get(text):
+            idx = positions[text].popleft()
+            errors.append(abs(start - truth[idx][0]))
+
+    errors.sort()
+    return {
+        "cues": len(truth),
+        "placed": len(errors),
+        f"within_{CORRECT_WITHIN_MS}ms": sum(e <= CORRECT_WITHIN_MS for e in errors) / max(len(truth), 1),
+        "mean_abs_error_ms": sum(errors) / max(len(errors), 1),
+        "p95_abs_error_ms": errors[int(len(errors) * 0.95)] if errors else None,
+    }
+
+
+def reconcile_case(text_path, timing_path, output_file, settings, profiler, auto_shift=False):
+    """Load, shift and reconcile one pair → (shifted text cues, timing cues, summary, shift estimate)"""
+    with profiler.stage("load"):
+        text_cues = load_cues(text_path)
+        timing_cues = load_cues(timing_path)
+    text_store = TextStore.from_cues(text_cues)
+    timing_store = TextStore.from_cues(timing_cues)
+
+    shift = (DEFAULTS["shift_start_ms"], DEFAULTS["shift_end_ms"])
+    estimate = None
+    if auto_shift:
+        with profiler.stage("auto_shift"):
+            estimate = estimate_shift(text_cues, timing_cues, text_store, timing_store, scorer=settings["scorer"])
+        shift = (estimate["shift_start_ms"], estimate["shift_end_ms"])
+        if estimate["tolerance_ms"] is not None:
+            settings = {**settings, "time_tolerance_start": estimate["tolerance_ms"],
+                        "time_tolerance_end": estimate["tolerance_ms"]}
+    with profiler.stage("shift"):
+        apply_time_shift_linear(text_cues, *shift)
+
+    summary = reconcile_rank_fusion(
+        text_source=text_cues,
+        timing_source=timing_cues,
+        output_file=output_file,
+        text_store=text_store,
+        timing_store=timing_store,
+        profiler=profiler,
+        **settings,
+    )
+    return text_cues, timing_cues, summary, estimate
+
+
+def run_case(n_cues, seed, settings, directory, auto_shift=False, breaks=0, memory=False):
+    text_path, timing_path, truth_path = write_pair(directory, n_cues, seed, breaks=breaks)
+    with open(truth_path, encoding="utf-8") as f:
+        truth = json.load(f)["truth"]
+    output_file = os.path.join(directory, "final.srt")
+
+    profiler = Profiler(enabled=True)
+    text_cues, timing_cues, summary, estimate = reconcile_case(
+        text_path, timing_path, output_file, settings, profiler, auto_shift
+    )
+    run = {
+        "n_cues": n_cues,
+        "seed": seed,
+        "text_cues": len(text_cues),
+        "timing_cues": len(timing_cues),
+        "summary": summary,
+        "shift_estimate": estimate,
+        "accuracy": accuracy(output_file, text_cues, truth),
+        "profile": profiler.report(),
+    }
+    if memory:
+        # tracemalloc slows every allocation down: a separate pass, never timed
+        memory_profiler = Profiler(enabled=True, trace_memory=True)
+        reconcile_case(text_path, timing_path, output_file, settings, memory_profiler, auto_shift)
+        run["memory"] = memory_profiler.report()["stages"]
+    return run
+
+
+def compare(runs, baseline_path):
+    """Print time and accuracy deltas against an earlier report"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(run["n_cues"], run["seed"]): run for run in json.load(f)["runs"]}
+    key = f"within_{CORRECT_WITHIN_MS}ms"
+    for run in runs:
+        old = baseline.get((run["n_cues"], run["seed"]))
+        if old is None:
+            continue
+        old_s, new_s = old["profile"]["total_wall_s"], run["profile"]["total_wall_s"]
+        print(f"Δ {run['n_cues']:>7} cues: time {new_s - old_s:+8.2f}s ({new_s / max(old_s, 1e-9):.2f}x)  "
+              f"accuracy {run['accuracy'][key] - old['accuracy'][key]:+.2%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark reconciliation on synthetic subtitles")
+    parser.add_argument("--sizes", default="1000,5000", help="comma-separated cue counts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--config", default="config.ini", help="config file whose [matching] is used")
+    parser.add_argument("--out", default="files/output/bench.json", help="JSON report path")
+    parser.add_argument("--compare", metavar="PREVIOUS.json", help="earlier report to diff against")
+    parser.add_argument("--auto-shift", action="store_true", help="estimate the drift instead of using the known one")
+    parser.add_argument("--breaks", type=int, default=0, help="commercial breaks cut from the text file")
+    parser.add_argument("--memory", action="store_true", help="also trace per-stage peak memory in a second pass")
+    args = parser.parse_args(argv)
+
+    config = configparser.ConfigParser()
+    config.read(args.config)
+    settings = matching_settings(config)
+
+    runs = []
+    for n_cues in (int(size) for size in args.sizes.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            runs.append(run_case(n_cues, args.seed, settings, tmp, args.auto_shift, args.breaks, args.memory))
+
+    key = f"within_{CORRECT_WITHIN_MS}ms"
+    print(f"\n{'cues':>8} {'time s':>9} {'cues/s':>9} {key:>12} {'mean err ms':>12} {'p95 err ms':>11}")
+    for run in runs:
+        wall = run["profile"]["total_wall_s"]
+        acc = run["accuracy"]
+        print(f"{run['n_cues']:>8} {wall:>9.2f} {run['text_cues'] / max(wall, 1e-9):>9.0f} "
+              f"{acc[key]:>12.2%} {acc['mean_abs_error_ms']:>12.0f} {acc['p95_abs_error_ms'] or 0:>11}")
+
+    if args.compare:
+        compare(runs, args.compare)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "config": args.config,
+            "settings": settings,
+            "generator": {**DEFAULTS, "breaks": args.breaks},
+            "runs": runs,
+        }, f, indent=2)
+    print(f"✔ Benchmark report saved to: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
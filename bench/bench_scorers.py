@@ -0,0 +1,176 @@
+"""
+Ranking agreement of the similarity scorers with difflib, the reference.
+
+indel and rapidfuzz compute the indel ratio 2*LCS/(len(a)+len(b)), which
+is never below difflib's ratio (its matching blocks are one common
+subsequence, not always the longest), so the same min_similarity keeps
+more pairs and rankings may differ. This compares, for every timing cue,
+the top_k text cues each scorer ranks against difflib's.
+
+    python bench/bench_scorers.py [--sizes 2000] [--seeds 0,1]
+                                  [--config config.ini] [--out scorers.json]
+                                  [--text TEXT.srt --timing TIMING.srt]
+
+The reference corpus is synthetic pairs (bench/synthetic.py) with their
+known drift undone, or one real pair given with --text / --timing
+(already shifted). Tolerance, min_similarity and top_k come from the
+[matching] section of --config. Reported per scorer:
+- top-k same : timing cues whose ranked top_k list is identical to
+  difflib's, at min_similarity (cues empty for both are not counted)
+- top-1 same : timing cues whose best text cue is the same
+- overlap    : mean share of text cues the two top_k lists have in common
+- pairs      : pairs kept at min_similarity (difflib's count in brackets)
+- same count : the min_similarity at which the scorer keeps as many pairs
+  as difflib does, i.e. the difflib threshold on the scorer's scale
+
+bench/check_scorers.py turns the top-1 figure into a pass/fail check on
+the committed reference corpus.
+"""
+import argparse
+import configparser
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.synthetic import DEFAULTS, write_pair
+from functions.apply_time_shift import apply_time_shift_linear
+from functions.build_ranks import ranks_from_scores
+from functions.score_pairs import score_pairs
+from functions.scorers import SCORERS, get_scorer
+from functions.srt_stream import load_cues
+from functions.text_store import TextStore
+
+
+def timing_rankings(scores, n_timing, n_text, top_k):
+    """{t_idx: [s_idx, ...]} best first, as rank fusion sees them"""
+    timing_ranks, _ = ranks_from_scores(scores, n_timing, n_text, top_k)
+    return {t_idx: sorted(row, key=row.get) for t_idx, row in timing_ranks.items()}
+
+
+def agreement(rankings, reference):
+    """
+    Share of timing cues with the same top-k list and with the same best
+    cue as reference, and mean overlap of the top-k lists
+    """
+    rows = [t_idx for t_idx in reference if rankings[t_idx] or reference[t_idx]]
+    if not rows:
+        return 1.0, 1.0, 1.0
+    same = sum(rankings[t_idx] == reference[t_idx] for t_idx in rows)
+    same_top = sum(rankings[t_idx][:1] == reference[t_idx][:1] for t_idx in rows)
+    overlap = sum(
+        len(set(rankings[t_idx]) & set(reference[t_idx])) / len(set(rankings[t_idx]) | set(reference[t_idx]))
+        for t_idx in rows
+    )
+    return same / len(rows), same_top / len(rows), overlap / len(rows)
+
+
+def compare_corpus(text_cues, timing_cues, settings, scorers):
+    text_store = TextStore.from_cues(text_cues)
+    timing_store = TextStore.from_cues(timing_cues)
+    n_timing, n_text = len(timing_cues), len(text_cues)
+
+    def rankings(scorer, min_similarity):
+        # progress bars would drown the table
+        with contextlib.redirect_stderr(io.StringIO()):
+            scores = score_pairs(
+                text_cues,
+                timing_cues,
+                settings["time_tolerance_start"],
+                settings["time_tolerance_end"],
+                min_similarity,
+                text_store=text_store,
+                timing_store=timing_store,
+                scorer=scorer,
+            )
+        return scores, timing_rankings(scores, n_timing, n_text, settings["top_k"])
+
+    reference_scores, reference = rankings("difflib", settings["min_similarity"])
+    results = {}
+    for scorer in scorers:
+        scores, ranked = rankings(scorer, settings["min_similarity"])
+        # every window pair, to find where the scorer keeps difflib's pair count
+        all_sims = sorted(rankings(scorer, 0.0)[0].values(), reverse=True)
+        top_k_same, top_1_same, overlap = agreement(ranked, reference)
+        results[scorer] = {
+            "top_k_same": top_k_same,
+            "top_1_same": top_1_same,
+            "overlap": overlap,
+            "pairs": len(scores),
+            "difflib_pairs": len(reference_scores),
+            "same_count_cutoff": all_sims[len(reference_scores) - 1] if reference_scores else None,
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ranking agreement of the scorers with difflib")
+    parser.add_argument("--sizes", default="2000", help="comma-separated cue counts of the synthetic pairs")
+    parser.add_argument("--seeds", default="0,1", help="comma-separated generator seeds")
+    parser.add_argument("--config", default="config.ini", help="config file whose [matching] is used")
+    parser.add_argument("--text", help="real text SRT instead of the synthetic pairs (with --timing)")
+    parser.add_argument("--timing", help="real timing SRT instead of the synthetic pairs (with --text)")
+    parser.add_argument("--out", help="JSON report path")
+    args = parser.parse_args(argv)
+
+    config = configparser.ConfigParser()
+    config.read(args.config)
+    matching = config["matching"]
+    settings = {
+        "time_tolerance_start": matching.getint("time_tolerance_ms_start"),
+        "time_tolerance_end": matching.getint("time_tolerance_ms_end"),
+        "min_similarity": matching.getfloat("min_similarity"),
+        "top_k": matching.getint("top_k"),
+    }
+
+    scorers = []
+    for name in SCORERS:
+        if name == "difflib":
+            continue
+        try:
+            get_scorer(name)
+        except ImportError as error:
+            print(f"⚠ {error}, skipped")
+            continue
+        scorers.append(name)
+
+    corpora = []
+    if args.text or args.timing:
+        if not (args.text and args.timing):
+            parser.error("--text and --timing go together")
+        corpora.append((os.path.basename(args.text), load_cues(args.text), load_cues(args.timing)))
+    else:
+        for n_cues in (int(size) for size in args.sizes.split(",")):
+            for seed in (int(seed) for seed in args.seeds.split(",")):
+                with tempfile.TemporaryDirectory() as tmp:
+                    text_path, timing_path, _ = write_pair(tmp, n_cues, seed)
+                    text_cues, timing_cues = load_cues(text_path), load_cues(timing_path)
+                apply_time_shift_linear(text_cues, DEFAULTS["shift_start_ms"], DEFAULTS["shift_end_ms"])
+                corpora.append((f"{n_cues} cues, seed {seed}", text_cues, timing_cues))
+
+    print(f"▶ min_similarity {settings['min_similarity']}, top_k {settings['top_k']}, "
+          f"tolerance {settings['time_tolerance_start']} → {settings['time_tolerance_end']} ms")
+    print(f"{'corpus':<22}{'scorer':<11}{'top-k same':>11}{'top-1 same':>11}{'overlap':>9}"
+          f"{'pairs':>14}{'same count':>12}")
+    runs = []
+    for name, text_cues, timing_cues in corpora:
+        results = compare_corpus(text_cues, timing_cues, settings, scorers)
+        runs.append({"corpus": name, "results": results})
+        for scorer, result in results.items():
+            pairs = f"{result['pairs']} ({result['difflib_pairs']})"
+            print(f"{name:<22}{scorer:<11}{result['top_k_same']:>11.2%}{result['top_1_same']:>11.2%}"
+                  f"{result['overlap']:>9.2%}{pairs:>14}{result['same_count_cutoff'] or 0:>12.3f}")
+
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"config": args.config, "settings": settings, "runs": runs}, f, indent=2)
+        print(f"✔ Scorer agreement report saved to: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
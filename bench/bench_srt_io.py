@@ -0,0 +1,52 @@
+"""
+Parse / write throughput of the streaming SRT reader and writer
+against pysrt, on a generated file.
+
+    python bench/bench_srt_io.py [n_cues]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pysrt
+from functions.srt_stream import format_time, load_cues, write_srt
+
+
+def make_srt(path, n_cues):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n_cues):
+            start = i * 3000
+            f.write(f"{i + 1}\n{format_time(start)} --> {format_time(start + 2500)}\n"
+                    f"Line {i} of the subtitle\nsecond line\n\n")
+
+
+def timed(label, n_cues, func):
+    t0 = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - t0
+    print(f"{label:<16}: {elapsed:7.3f}s  ({n_cues / elapsed:,.0f} cues/s)")
+
+
+def main():
+    n_cues = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "big.srt")
+        out = os.path.join(tmp, "out.srt")
+        make_srt(src, n_cues)
+        print(f"▶ {n_cues} cues, {os.path.getsize(src) / 1e6:.1f} MB")
+
+        timed("pysrt read", n_cues, lambda: pysrt.open(src, encoding="utf-8"))
+        timed("stream read", n_cues, lambda: load_cues(src))
+
+        subs = pysrt.open(src, encoding="utf-8")
+        cues = load_cues(src)
+        timed("pysrt write", n_cues, lambda: subs.save(out, encoding="utf-8"))
+        timed("stream write", n_cues, lambda: write_srt(out, zip(cues.starts, cues.ends, cues.texts)))
+
+
+if __name__ == "__main__":
+    main()
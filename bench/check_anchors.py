@@ -0,0 +1,75 @@
+"""
+Randomized brute-force check of monotonic anchor selection: on many small
+random candidate lists, select_anchors_monotonic must return an order-
+preserving subset of the candidates whose total weight (sum of
+1 / avg_rank) equals the best one found by trying every subset.
+
+    python bench/check_anchors.py [trials] [seed]
+
+Exits with status 1 and prints the first failing candidate list.
+"""
+import os
+import random
+import sys
+from itertools import combinations
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functions.select_anchors import select_anchors_monotonic
+
+
+def random_candidates(rng, max_candidates=9, max_idx=6):
+    """(avg_rank, text_idx, time_idx) with repeated indexes and ties"""
+    return [
+        (rng.choice([1.0, 1.5, 2.0, 2.5, 3.0]), rng.randint(0, max_idx), rng.randint(0, max_idx))
+        for _ in range(rng.randint(0, max_candidates))
+    ]
+
+
+def is_monotonic(pairs):
+    ordered = sorted(pairs)
+    return all(b[0] > a[0] and b[1] > a[1] for a, b in zip(ordered, ordered[1:]))
+
+
+def brute_force_weight(candidates):
+    """Best total weight over every order-preserving subset"""
+    best = 0.0
+    for size in range(1, len(candidates) + 1):
+        for subset in combinations(candidates, size):
+            if is_monotonic([(text_idx, time_idx) for _, text_idx, time_idx in subset]):
+                best = max(best, sum(1.0 / avg for avg, _, _ in subset))
+    return best
+
+
+def check(candidates):
+    """None if select_anchors_monotonic is optimal on candidates, else the reason"""
+    rank_matches = select_anchors_monotonic(candidates)
+    weights = {}
+    for avg, text_idx, time_idx in candidates:
+        weights[(text_idx, time_idx)] = max(weights.get((text_idx, time_idx), 0.0), 1.0 / avg)
+    if any(pair not in weights for pair in rank_matches):
+        return f"anchors {rank_matches} are not all candidates"
+    if not is_monotonic(rank_matches) or rank_matches != sorted(rank_matches):
+        return f"anchors {rank_matches} are not strictly increasing"
+    weight = sum(weights[pair] for pair in rank_matches)
+    expected = brute_force_weight(candidates)
+    if abs(weight - expected) > 1e-9:
+        return f"weight {weight:.4f}, best is {expected:.4f}"
+    return None
+
+
+def main():
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    rng = random.Random(seed)
+    for trial in range(trials):
+        candidates = random_candidates(rng)
+        problem = check(candidates)
+        if problem is not None:
+            print(f"✘ trial {trial}: {problem}\n  candidates = {candidates!r}")
+            sys.exit(1)
+    print(f"✔ monotonic anchors optimal on {trials} random candidate lists (seed {seed})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Agreement check of the indel-ratio scorers with difflib on the committed
+reference corpus (bench/corpus: a 1000-cue bench/synthetic.py pair, seed 0,
+with its drift already undone), at the default [matching] settings.
+
+    python bench/check_scorers.py [--min-top-1 0.97]
+
+indel and rapidfuzz rank on a different scale than difflib (see
+bench/bench_scorers.py), so only the best text cue of each timing cue is
+required to agree. Exits with status 1 when a scorer's top-1 agreement
+drops below --min-top-1; a scorer whose backend is missing is skipped.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.bench_scorers import compare_corpus
+from functions.scorers import SCORERS, get_scorer
+from functions.srt_stream import load_cues
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+
+# config.ini [matching] defaults the agreement was measured at
+SETTINGS = {
+    "time_tolerance_start": 20000,
+    "time_tolerance_end": 20000,
+    "min_similarity": 0.4,
+    "top_k": 8,
+}
+
+# top-1 agreement measured when the corpus was committed: 98.4% for both
+MIN_TOP_1 = 0.97
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check scorer agreement with difflib on the reference corpus")
+    parser.add_argument("--min-top-1", type=float, default=MIN_TOP_1,
+                        help="lowest accepted share of timing cues with difflib's best text cue")
+    args = parser.parse_args(argv)
+
+    scorers = []
+    for name in SCORERS:
+        if name == "difflib":
+            continue
+        try:
+            get_scorer(name)
+        except ImportError as error:
+            print(f"⚠ {error}, skipped")
+            continue
+        scorers.append(name)
+
+    text_cues = load_cues(os.path.join(CORPUS, "text.srt"))
+    timing_cues = load_cues(os.path.join(CORPUS, "timing.srt"))
+    results = compare_corpus(text_cues, timing_cues, SETTINGS, scorers)
+
+    failed = False
+    for scorer, result in results.items():
+        if result["top_1_same"] < args.min_top_1:
+            failed = True
+            print(f"✘ {scorer}: top-1 agreement {result['top_1_same']:.2%} < {args.min_top_1:.2%}")
+        else:
+            print(f"✔ {scorer}: top-1 agreement {result['top_1_same']:.2%} "
+                  f"(top-k {result['top_k_same']:.2%}, same pair count at {result['same_count_cutoff']:.3f})")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
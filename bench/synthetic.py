@@ -0,0 +1,178 @@
+"""
+Synthetic text/timing SRT pairs with a known ground truth.
+
+The timing file carries the reference clock and OCR-style noise; the text
+file carries clean text with a linear drift, cue splits and merges,
+dropped lines and optional jumps where commercial breaks were cut. For
+every text cue the ground truth is where it belongs on the timing clock.
+
+    python bench/synthetic.py OUT_DIR [n_cues] [seed]
+
+writes OUT_DIR/text.srt, OUT_DIR/timing.srt and OUT_DIR/truth.json.
+"""
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functions.srt_stream import write_srt
+
+WORDS = (
+    "the a we you they he she it go come see know never always time night day "
+    "love war ship captain run stop where why how what is are was there here "
+    "home road light dark sea sky fire water stone king queen find lost take "
+    "give back down over under again still only tell told think thought sir "
+    "my your our their father mother brother sister friend enemy gold sword "
+    "horse river city gate wall tower morning evening tomorrow yesterday now"
+).split()
+
+# characters OCR tends to confuse
+OCR_CONFUSIONS = {
+    "l": "1I", "i": "l!", "o": "0", "e": "c", "a": "o", "n": "m", "m": "rn",
+    "s": "5", "t": "f", "c": "e", "h": "b", "u": "v", "g": "q", "r": "n",
+}
+
+DEFAULTS = {
+    "shift_start_ms": -2000,
+    "shift_end_ms": 6000,
+    "jitter_ms": 200,
+    "split_rate": 0.05,
+    "merge_rate": 0.05,
+    "drop_text_rate": 0.02,
+    "drop_timing_rate": 0.04,
+    "ocr_rate": 0.04,
+    # commercial breaks missing from the text file: each one moves every
+    # later text cue up to break_ms earlier
+    "breaks": 0,
+    "break_ms": 120000,
+}
+
+
+def ocr_noise(text, rate, rng):
+    """Character-level OCR errors: confusions, deletions, stray characters"""
+    out = []
+    for char in text:
+        roll = rng.random()
+        if roll >= rate or char == "\n":
+            out.append(char)
+        elif roll < rate * 0.6 and char.lower() in OCR_CONFUSIONS:
+            out.append(rng.choice(OCR_CONFUSIONS[char.lower()]))
+        elif roll < rate * 0.85:
+            continue
+        else:
+            out.append(char + rng.choice(".,'"))
+    return "".join(out)
+
+
+def _sentence(rng):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(3, 10))]
+    words[0] = words[0].capitalize()
+    text = " ".join(words)
+    if len(words) > 6 and rng.random() < 0.5:
+        cut = text.index(" ", len(text) // 2 - 1)
+        text = text[:cut] + "\n" + text[cut + 1:]
+    return text
+
+
+def generate_pair(n_cues, seed=0, **params):
+    """
+    → (text_cues, timing_cues, truth), cue lists of (start_ms, end_ms, text).
+    truth[i] = (start_ms, end_ms) of text cue i on the timing clock.
+    params override DEFAULTS; shift_start_ms/shift_end_ms are the linear
+    shift that puts the text file back on the timing clock.
+    """
+    settings = {**DEFAULTS, **params}
+    rng = random.Random(seed)
+
+    # ── Reference timeline ─────────────────────────────────────
+    reference = []
+    clock = 1000
+    for _ in range(n_cues):
+        duration = rng.randint(800, 4500)
+        reference.append((clock, clock + duration, _sentence(rng)))
+        clock += duration + rng.randint(80, 3000)
+
+    # ── Timing file: reference clock, OCR text, dropped lines ──
+    timing_cues = [
+        (start, end, ocr_noise(text, settings["ocr_rate"], rng))
+        for start, end, text in reference
+        if rng.random() >= settings["drop_timing_rate"]
+    ]
+
+    # ── Text file: clean text, splits, merges, dropped lines ───
+    truth = []
+    idx = 0
+    while idx < len(reference):
+        start, end, text = reference[idx]
+        idx += 1
+        roll = rng.random()
+        if roll < settings["drop_text_rate"]:
+            continue
+        if roll < settings["drop_text_rate"] + settings["merge_rate"] and idx < len(reference):
+            _, end, next_text = reference[idx]
+            idx += 1
+            truth.append((start, end, text.replace("\n", " ") + "\n" + next_text.replace("\n", " ")))
+        elif roll < settings["drop_text_rate"] + settings["merge_rate"] + settings["split_rate"]:
+            words = text.split()
+            head, tail = " ".join(words[:len(words) // 2]), " ".join(words[len(words) // 2:])
+            middle = start + (end - start) * len(head) // (len(head) + len(tail))
+            truth.append((start, middle, head))
+            truth.append((middle, end, tail))
+        else:
+            truth.append((start, end, text))
+
+    # Drift is undone by apply_time_shift_linear(shift_start_ms, shift_end_ms)
+    first, last = truth[0][0], truth[-1][1]
+    span = max(last - first, 1)
+    cut_at = sorted(rng.sample(range(1, len(truth)), settings["breaks"])) if settings["breaks"] else []
+    cuts = {idx: rng.randint(settings["break_ms"] // 4, settings["break_ms"]) for idx in cut_at}
+    cut_ms = 0
+    text_cues = []
+    for idx, (start, end, text) in enumerate(truth):
+        cut_ms += cuts.get(idx, 0)
+        ratio = ((start + end) / 2 - first) / span
+        shift = settings["shift_start_ms"] + ratio * (settings["shift_end_ms"] - settings["shift_start_ms"])
+        jitter = rng.randint(-settings["jitter_ms"], settings["jitter_ms"])
+        text_cues.append((
+            max(int(start - shift - cut_ms + jitter), 0),
+            max(int(end - shift - cut_ms + jitter), 0),
+            text,
+        ))
+
+    return text_cues, timing_cues, [(start, end) for start, end, _ in truth]
+
+
+def write_pair(directory, n_cues, seed=0, **params):
+    """Generate a pair into directory → (text_path, timing_path, truth_path)"""
+    text_cues, timing_cues, truth = generate_pair(n_cues, seed, **params)
+    os.makedirs(directory, exist_ok=True)
+    text_path = os.path.join(directory, "text.srt")
+    timing_path = os.path.join(directory, "timing.srt")
+    truth_path = os.path.join(directory, "truth.json")
+    write_srt(text_path, text_cues)
+    write_srt(timing_path, timing_cues)
+    with open(truth_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "n_cues": n_cues,
+            "seed": seed,
+            "params": {**DEFAULTS, **params},
+            "truth": truth,
+        }, f)
+    return text_path, timing_path, truth_path
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    directory = sys.argv[1]
+    n_cues = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    paths = write_pair(directory, n_cues, seed)
+    print("✔ Wrote " + ", ".join(paths))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+import argparse
+import contextlib
+import os
+import sys
+
+# SRT written to stdout bypasses colorama's wrapper (no color codes in the file)
+STDOUT = sys.stdout
+
+COMMANDS = ("reconcile", "shift", "reindex", "sweep", "bench", "serve", "client")
+# commands whose own options are passed through untouched
+PASS_THROUGH = ("sweep", "bench")
+
+
+def _console(srt_on_stdout):
+    """Console messages go to stderr while SRT is written to stdout"""
+    return contextlib.redirect_stdout(sys.stderr) if srt_on_stdout else contextlib.nullcontext()
+
+
+def _read_config(path):
+    import configparser
+
+    config = configparser.ConfigParser()
+    config.read(path, encoding="utf-8")
+    for section in ("files", "shift"):
+        if not config.has_section(section):
+            config.add_section(section)
+    return config
+
+
+# ─────────────── Subcommands (each imports what it needs) ───────────────
+
+def run_reconcile(args):
+    """Shift, reconcile and reindex in memory: no intermediate files"""
+    from colorama import init, Fore
+    from functions.profiler import Profiler
+    from functions.reconcile_from_config import reconcile_from_config
+    from functions.srt_stream import load_cues
+
+    init(autoreset=True)
+    config = _read_config(args.config)
+    if args.text:
+        config["files"]["text_source"] = args.text
+    if args.timing:
+        config["files"]["timing_source"] = args.timing
+    if args.shift_start is not None:
+        config["shift"]["shift_start_ms"] = str(args.shift_start)
+    if args.shift_end is not None:
+        config["shift"]["shift_end_ms"] = str(args.shift_end)
+
+    to_stdout = args.output == "-"
+    with _console(to_stdout):
+        text_cues = load_cues(sys.stdin) if args.text == "-" else None
+        profiler = Profiler(enabled=bool(args.profile), trace_memory=args.profile_memory)
+        reconcile_from_config(
+            config,
+            args.workers,
+            profiler,
+            text_cues=text_cues,
+            output_file=STDOUT if to_stdout else args.output,
+        )
+        if args.profile:
+            profiler.save(args.profile)
+            print(Fore.CYAN + f"ℹ Profile report saved to: {args.profile}")
+
+
+def run_shift(args):
+    """Linear shift of one SRT file (as linear_shit.py)"""
+    from pathlib import Path
+    from functions.apply_time_shift import apply_time_shift_linear
+    from functions.srt_stream import load_cues, write_srt
+
+    config = _read_config(args.config)
+    input_path = args.input or config.get("files", "text_source")
+    shift_start_ms = args.start if args.start is not None else config.getint("shift", "shift_start_ms", fallback=0)
+    shift_end_ms = args.end if args.end is not None else config.getint("shift", "shift_end_ms", fallback=0)
+    output_path = args.output
+    if output_path is None:
+        output_path = "-" if input_path == "-" else str(Path(config.get("files", "output")).with_name(
+            Path(input_path).stem + "_linear_shifted.srt"
+        ))
+
+    with _console(output_path == "-"):
+        cues = load_cues(sys.stdin if input_path == "-" else input_path, encoding="utf-8")
+        apply_time_shift_linear(cues, shift_start_ms, shift_end_ms)
+        write_srt(STDOUT if output_path == "-" else output_path, zip(cues.starts, cues.ends, cues.texts))
+        print("✔ Linear shift applied")
+        print(f"  start shift: {shift_start_ms} ms")
+        print(f"  end shift  : {shift_end_ms} ms")
+        print(f"  output     : {output_path if output_path != '-' else 'stdout'}")
+
+
+def run_reindex(args):
+    """Renumber cues 1..n, streamed (as fix_srt_index.py)"""
+    import os
+    from functions.srt_stream import read_srt, write_srt
+
+    if args.input != "-" and args.output != "-" and os.path.abspath(args.input) == os.path.abspath(args.output):
+        raise SystemExit("Input and output must be different files (cues are streamed)")
+    with _console(args.output == "-"):
+        count = write_srt(
+            STDOUT if args.output == "-" else args.output,
+            read_srt(sys.stdin if args.input == "-" else args.input, encoding="utf-8"),
+        )
+        print(f"✔ Re-indexed SRT saved to: {args.output if args.output != '-' else 'stdout'} ({count} subtitles)")
+
+
+def run_serve(args):
+    """Long-running service: warm pool and caches shared by every job"""
+    from colorama import init, Fore
+    from functions.daemon import ReconcileDaemon, make_server
+
+    init(autoreset=True)
+    config = _read_config(args.config)
+    host = args.host or config.get("daemon", "host", fallback="127.0.0.1")
+    port = args.port or config.getint("daemon", "port", fallback=8765)
+    daemon = ReconcileDaemon(
+        workers=args.workers or config.getint("daemon", "workers", fallback=2),
+        text_cache_entries=config.getint("daemon", "text_cache_entries", fallback=32),
+        rank_cache_entries=config.getint("daemon", "rank_cache_entries", fallback=64),
+    )
+    daemon.start()
+    server = make_server(daemon, host, port)
+    print(Fore.CYAN + f"▶ Reconciliation service on http://{host}:{port} ({daemon.workers} warm workers, Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(Fore.CYAN + "▶ Stopping")
+    finally:
+        server.server_close()
+        daemon.stop()
+
+
+def run_client(args):
+    """Send the [files] pair and settings of --config to a running service"""
+    import json
+    import urllib.error
+    from colorama import init, Fore
+    from functions.daemon import client_sections, fetch_metrics, submit_job
+
+    init(autoreset=True)
+    config = _read_config(args.config)
+    url = args.url or "http://{}:{}".format(
+        config.get("daemon", "host", fallback="127.0.0.1"), config.getint("daemon", "port", fallback=8765)
+    )
+    try:
+        if args.metrics:
+            print(json.dumps(fetch_metrics(url), indent=2))
+            return
+        for key, value in (("text_source", args.text), ("timing_source", args.timing), ("output", args.output)):
+            if value:
+                config["files"][key] = value
+
+        def on_event(event):
+            if event["event"] == "log":
+                print(event["line"])
+            elif event["event"] == "progress":
+                print(event["line"], end="\r", file=sys.stderr)
+
+        last = submit_job(url, client_sections(config), on_event)
+    except urllib.error.URLError as error:
+        raise SystemExit(Fore.RED + f"✘ No reconciliation service at {url} ({error.reason})")
+
+    if last is None or last["event"] != "summary":
+        raise SystemExit(Fore.RED + f"✘ {last['error'] if last else 'No answer from the service'}")
+    print(Fore.CYAN + f"ℹ Service time    : {last['queue_ms']:.0f} ms queued, {last['run_ms']:.0f} ms running")
+
+
+def run_sweep(argv):
+    import sweep
+
+    sweep.main(argv)
+
+
+def run_bench(argv):
+    from bench import bench_reconcile
+
+    bench_reconcile.main(argv)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Subtitle reconciliation tools. '-' as a file reads SRT from stdin or writes it to stdout.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True, metavar="{" + ",".join(COMMANDS) + "}")
+
+    reconcile = commands.add_parser("reconcile", help="shift, reconcile and reindex the [files] pair in memory")
+    reconcile.add_argument("--config", default="config.ini", help="path to the config file")
+    reconcile.add_argument("--text", help="text SRT, or - for stdin (overrides [files] text_source)")
+    reconcile.add_argument("--timing", help="timing SRT (overrides [files] timing_source)")
+    reconcile.add_argument("-o", "--output", help="output SRT, or - for stdout (overrides [files] output)")
+    reconcile.add_argument("--shift-start", type=int, metavar="MS", help="overrides [shift] shift_start_ms")
+    reconcile.add_argument("--shift-end", type=int, metavar="MS", help="overrides [shift] shift_end_ms")
+    reconcile.add_argument("--workers", type=int, help="processes used to score pairs (overrides config)")
+    reconcile.add_argument("--profile", metavar="REPORT.json", help="write per-stage time, peak RSS and counters")
+    reconcile.add_argument("--profile-memory", action="store_true",
+                           help="with --profile, trace the peak memory of each stage instead of its time (slow)")
+
+    shift = commands.add_parser("shift", help="apply a linear time shift to one SRT file")
+    shift.add_argument("input", nargs="?", help="SRT file or - (default: [files] text_source)")
+    shift.add_argument("-o", "--output", help="output SRT or - (default: <input>_linear_shifted.srt)")
+    shift.add_argument("--start", type=int, metavar="MS", help="shift at the first cue (default: [shift] shift_start_ms)")
+    shift.add_argument("--end", type=int, metavar="MS", help="shift at the last cue (default: [shift] shift_end_ms)")
+    shift.add_argument("--config", default="config.ini", help="path to the config file")
+
+    reindex = commands.add_parser("reindex", help="renumber the cues of an SRT file")
+    reindex.add_argument("input", help="SRT file or -")
+    reindex.add_argument("-o", "--output", default="-", help="output SRT or - (default)")
+
+    serve = commands.add_parser("serve", help="run a local reconciliation service (warm pool, shared caches)")
+    serve.add_argument("--config", default="config.ini", help="config file whose [daemon] section is used")
+    serve.add_argument("--host", help="overrides [daemon] host")
+    serve.add_argument("--port", type=int, help="overrides [daemon] port")
+    serve.add_argument("--workers", type=int, help="warm pool size (overrides [daemon] workers)")
+
+    client = commands.add_parser("client", help="reconcile through a running service, like reconcile")
+    client.add_argument("--config", default="config.ini", help="job settings, sent as they are in the file")
+    client.add_argument("--text", help="overrides [files] text_source")
+    client.add_argument("--timing", help="overrides [files] timing_source")
+    client.add_argument("-o", "--output", help="overrides [files] output")
+    client.add_argument("--url", help="service address (default: from [daemon])")
+    client.add_argument("--metrics", action="store_true", help="print queue depth, latency and cache metrics")
+
+    commands.add_parser("sweep", help="evaluate a grid of matching settings (sweep.py options)", add_help=False)
+    commands.add_parser("bench", help="synthetic benchmark (bench/bench_reconcile.py options)", add_help=False)
+    return parser
+
+
+def _run(argv):
+    # sweep / bench parse their own options
+    if argv and argv[0] in PASS_THROUGH:
+        (run_sweep if argv[0] == "sweep" else run_bench)(argv[1:])
+        return
+
+    args = build_parser().parse_args(argv)
+    {
+        "reconcile": run_reconcile,
+        "shift": run_shift,
+        "reindex": run_reindex,
+        "serve": run_serve,
+        "client": run_client,
+    }[args.command](args)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    try:
+        _run(argv)
+    except BrokenPipeError:
+        # the reader of stdout has gone (e.g. `| head`): stop quietly, and point
+        # stdout at devnull so the interpreter's final flush does not fail again
+        os.dup2(os.open(os.devnull, os.O_WRONLY), STDOUT.fileno())
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
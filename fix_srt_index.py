@@ -1,20 +1,17 @@
-import pysrt
+import os
+from functions.srt_stream import read_srt, write_srt
 
 INPUT_FILE = "files/output/v29-0.5-sim.srt"
 OUTPUT_FILE = "files/output/v29-fixed.srt"
 
 def fix_srt_indexes(input_file, output_file):
-    subs = pysrt.open(input_file, encoding='utf-8')
-    
-    # Re-index all subtitles sequentially starting from 1
-    for idx, sub in enumerate(subs, start=1):
-        sub.index = idx
-    
-    # Optional: clean overlapping times (pysrt has a clean method)
-    # subs.clean_indexes()  # just to be sure
+    if os.path.abspath(input_file) == os.path.abspath(output_file):
+        raise ValueError("Input and output must be different files (cues are streamed)")
 
-    subs.save(output_file, encoding='utf-8')
-    print(f"✔ Re-indexed SRT saved to: {output_file}")
+    # Stream cues through: the writer re-indexes sequentially starting from 1
+    count = write_srt(output_file, read_srt(input_file, encoding='utf-8'), encoding='utf-8')
+
+    print(f"✔ Re-indexed SRT saved to: {output_file} ({count} subtitles)")
 
 if __name__ == "__main__":
     fix_srt_indexes(INPUT_FILE, OUTPUT_FILE)
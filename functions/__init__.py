@@ -1,6 +1,14 @@
 # This makes it a package
-from .to_ms import to_ms
 from .normalize import normalize
 from .similarity import similarity
 from .apply_time_shift import apply_time_shift
 # from .reconcile_subtitles import reconcile_subtitles
+
+
+def __getattr__(name):
+    # to_ms needs pysrt: imported on first use, not by every `import functions.x`
+    if name == "to_ms":
+        from .to_ms import to_ms
+        globals()["to_ms"] = to_ms  # shadows the submodule, as an eager import did
+        return to_ms
+    raise AttributeError(f"module 'functions' has no attribute '{name}'")
@@ -0,0 +1,137 @@
+import math
+from statistics import median
+from tqdm import tqdm
+
+# traceback moves
+UP, LEFT, DIAG = 0, 1, 2
+
+# text rows on each side whose best matches give a row's local band
+NEIGHBOURHOOD = 16
+
+
+def align_banded(scores, n_text, n_timing):
+    """
+    Global alignment (Needleman–Wunsch, free gaps) of text cues against
+    timing cues, maximizing the summed similarity of matched pairs.
+    Only pairs present in scores can match, so each text row is limited
+    to the band of timing cues inside its tolerance window: time and
+    memory are O(N × band), not O(N × M). Pairs far outside the band of
+    their neighbouring rows are left out (see _local_scores): one outlier
+    would otherwise widen the band of every later row.
+    The traceback only keeps value rows every ~sqrt(N) rows and recomputes
+    one block at a time (checkpointing, as in Hirschberg), so memory stays
+    O(sqrt(N) × band) on hour-long inputs.
+    Returns matches [(text_idx, time_idx)] in order.
+    """
+    # sparse match scores per text row, and its band of DP columns
+    row_scores = [{} for _ in range(n_text)]
+    for (t_idx, s_idx), sim in scores.items():
+        row_scores[s_idx][t_idx + 1] = sim
+    row_scores = _local_scores(row_scores, n_timing)
+    bands = _monotonic_bands(row_scores, n_timing)
+
+    block = max(1, int(math.isqrt(n_text)))
+    checkpoints = {0: (1, [0.0])}  # row → (lo, values of columns lo-1 .. hi)
+    row = checkpoints[0]
+    for i in tqdm(range(1, n_text + 1), desc="Aligning", unit="sub"):
+        row, _ = _dp_row(row, bands[i - 1], row_scores[i - 1])
+        if i % block == 0:
+            checkpoints[i] = row
+
+    # traceback, one block at a time from the end
+    matches = []
+    i, j = n_text, n_timing
+    while i > 0:
+        start = (i - 1) // block * block
+        rows = [checkpoints[start]]
+        moves = []
+        for r in range(start + 1, i + 1):
+            next_row, row_moves = _dp_row(rows[-1], bands[r - 1], row_scores[r - 1])
+            rows.append(next_row)
+            moves.append(row_moves)
+
+        while i > start:
+            lo, values = rows[i - start]
+            hi = lo - 2 + len(values)
+            if j > hi:  # free moves along the row past its band
+                j = hi
+            move = moves[i - start - 1][j - lo + 1]
+            if move == DIAG:
+                matches.append((i - 1, j - 1))
+                i, j = i - 1, j - 1
+            elif move == LEFT:
+                j -= 1
+            else:
+                i -= 1
+
+    return matches[::-1]
+
+
+def _local_scores(row_scores, n_timing, neighbourhood=NEIGHBOURHOOD):
+    """
+    Drop pairs whose column is far from the best matches of the rows
+    around them. A row's centre follows the median offset of the best
+    columns of the NEIGHBOURHOOD rows on each side from the diagonal;
+    pairs further from it than the neighbourhood size plus twice the
+    typical row half-width (median distance of a row's columns to its
+    best one) are dropped. Such a pair could only be aligned by leaving
+    every row in between unmatched.
+    """
+    slope = n_timing / max(1, len(row_scores))
+    best = [max(cols, key=cols.get) if cols else None for cols in row_scores]
+    offsets = [None if col is None else col - i * slope for i, col in enumerate(best)]
+    half_widths = [max(abs(col - best[i]) for col in cols) for i, cols in enumerate(row_scores) if cols]
+    if not half_widths:
+        return row_scores
+    # offsets drift by up to one column per row inside the neighbourhood
+    radius = 2 * median(half_widths) + neighbourhood
+
+    local = []
+    for i, cols in enumerate(row_scores):
+        if not cols:
+            local.append(cols)
+            continue
+        around = [offset for offset in offsets[max(0, i - neighbourhood):i + neighbourhood + 1] if offset is not None]
+        centre = i * slope + median(around)
+        local.append({col: sim for col, sim in cols.items() if abs(col - centre) <= radius})
+    return local
+
+
+def _monotonic_bands(row_scores, n_timing):
+    """
+    Column band [lo, hi] per text row, widened so both bounds never
+    decrease from one row to the next (the path can always continue).
+    """
+    n = len(row_scores)
+    lows = [min(cols) if cols else n_timing + 1 for cols in row_scores]
+    highs = [max(cols) if cols else 0 for cols in row_scores]
+    for i in range(1, n):
+        highs[i] = max(highs[i], highs[i - 1])
+    for i in range(n - 2, -1, -1):
+        lows[i] = min(lows[i], lows[i + 1])
+    return [(min(lows[i], highs[i] + 1), highs[i]) for i in range(n)]
+
+
+def _get(row, j):
+    """D[previous row][j]; columns past the band keep the last value"""
+    lo, values = row
+    return values[min(j - lo + 1, len(values) - 1)]
+
+
+def _dp_row(prev, band, matches):
+    """Compute one DP row over its band; returns ((lo, values), moves)"""
+    lo, hi = band
+    values = [_get(prev, lo - 1)]
+    moves = bytearray([UP])
+    for j in range(lo, hi + 1):
+        best, move = _get(prev, j), UP
+        if values[-1] > best:
+            best, move = values[-1], LEFT
+        sim = matches.get(j)
+        if sim is not None:
+            diag = _get(prev, j - 1) + sim
+            if diag > best:
+                best, move = diag, DIAG
+        values.append(best)
+        moves.append(move)
+    return (lo, values), moves
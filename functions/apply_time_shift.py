@@ -1,31 +1,38 @@
-import pysrt
-from datetime import timedelta  # <-- use standard timedelta
+def apply_time_shift(cues, shift_ms):
+    """Shift all subtitles of a CueTable by shift_ms milliseconds"""
+    for idx in range(len(cues)):
+        cues.starts[idx] += shift_ms
+        cues.ends[idx] += shift_ms
 
-def apply_time_shift(subs, shift_ms):
-    """Shift all subtitles by shift_ms milliseconds"""
-    subs.shift(milliseconds=shift_ms)
-
-def apply_time_shift_linear(subs, shift_start_ms, shift_end_ms):
+def apply_time_shift_linear(cues, shift_start_ms, shift_end_ms):
     """
-    Linearly shift subtitles from shift_start_ms to shift_end_ms
-    across the whole file.
+    Linearly shift subtitles of a CueTable from shift_start_ms to
+    shift_end_ms across the whole file.
     """
 
-    if not subs:
+    if not len(cues):
         return
 
-    first_start = subs[0].start.ordinal
-    last_end = subs[-1].end.ordinal
+    first_start = cues.starts[0]
+    last_end = cues.ends[-1]
     total_duration = max(last_end - first_start, 1)
 
-    for sub in subs:
-        # Position of subtitle in timeline [0.0 .. 1.0]
-        center = (sub.start.ordinal + sub.end.ordinal) / 2
-        ratio = (center - first_start) / total_duration
+    for idx in range(len(cues)):
+        start = cues.starts[idx]
+        end = cues.ends[idx]
 
-        # Interpolated shift
-        shift_ms = shift_start_ms + ratio * (shift_end_ms - shift_start_ms)
+        shift_ms = linear_shift_ms(start, end, first_start, total_duration, shift_start_ms, shift_end_ms)
 
         # Apply shift
-        sub.start = pysrt.SubRipTime(milliseconds=int(sub.start.ordinal + shift_ms))
-        sub.end = pysrt.SubRipTime(milliseconds=int(sub.end.ordinal + shift_ms))
\ No newline at end of file
+        cues.starts[idx] = int(start + shift_ms)
+        cues.ends[idx] = int(end + shift_ms)
+
+
+def linear_shift_ms(start, end, first_start, total_duration, shift_start_ms, shift_end_ms):
+    """Shift apply_time_shift_linear gives one subtitle of a file starting at first_start"""
+    # Position of subtitle in timeline [0.0 .. 1.0]
+    center = (start + end) / 2
+    ratio = (center - first_start) / total_duration
+
+    # Interpolated shift
+    return shift_start_ms + ratio * (shift_end_ms - shift_start_ms)
@@ -0,0 +1,154 @@
+import configparser
+import contextlib
+import csv
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functions.reconcile_from_config import reconcile_from_config
+from functions.srt_stream import load_cues
+
+# per-job overrides allowed in a manifest
+OVERRIDE_SECTIONS = ("matching", "shift")
+
+
+def load_manifest(path):
+    """
+    Jobs of a CSV or JSON manifest → [{"name", "text", "timing", "output",
+    "matching": {...}, "shift": {...}}].
+    CSV: columns text, timing, output, optional name, and overrides as
+    "matching.<key>" / "shift.<key>" columns (empty cell = config value).
+    JSON: a list of such objects (or {"jobs": [...]}).
+    Relative file paths are relative to the manifest.
+    """
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        entries = data["jobs"] if isinstance(data, dict) else data
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            entries = []
+            for row in csv.DictReader(f):
+                entry = {section: {} for section in OVERRIDE_SECTIONS}
+                for column, value in row.items():
+                    section, _, key = column.partition(".")
+                    if key and section in OVERRIDE_SECTIONS:
+                        if value not in ("", None):
+                            entry[section][key] = value
+                    else:
+                        entry[column] = value
+                entries.append(entry)
+
+    base = os.path.dirname(os.path.abspath(path))
+    jobs = []
+    for number, entry in enumerate(entries, start=1):
+        job = {
+            "name": entry.get("name") or os.path.splitext(os.path.basename(entry["output"]))[0],
+            **{section: dict(entry.get(section) or {}) for section in OVERRIDE_SECTIONS},
+        }
+        for key in ("text", "timing", "output"):
+            if not entry.get(key):
+                raise ValueError(f"Manifest job {number} has no '{key}'")
+            job[key] = os.path.join(base, entry[key])
+        jobs.append(job)
+    return jobs
+
+
+def job_config(base_sections, job):
+    """ConfigParser of one job: the base config, its files and overrides"""
+    config = configparser.ConfigParser()
+    config.read_dict(base_sections)
+    for section in ("files", "performance", "incremental", "multi_source") + OVERRIDE_SECTIONS:
+        if not config.has_section(section):
+            config.add_section(section)
+    config["files"]["text_source"] = job["text"]
+    config["files"]["timing_source"] = job["timing"]
+    config["files"]["output"] = job["output"]
+    # the batch pool is the parallelism; state files are per single run
+    config["performance"]["workers"] = "1"
+    config["incremental"]["enabled"] = "false"
+    # a manifest row has a single timing file
+    config["multi_source"]["timing_sources"] = ""
+    for section in OVERRIDE_SECTIONS:
+        for key, value in job[section].items():
+            config[section][key] = str(value)
+    return config
+
+
+def run_job(base_sections, job, text_cues, timing_cues):
+    """
+    Reconcile one job (runs in a worker process) → result dict.
+    Console output is captured; an error fails this job only.
+    """
+    started = time.perf_counter()
+    log = io.StringIO()
+    try:
+        os.makedirs(os.path.dirname(job["output"]) or ".", exist_ok=True)
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            summary = reconcile_from_config(
+                job_config(base_sections, job), text_cues=text_cues, timing_cues=timing_cues
+            )
+        return {"status": "ok", **summary, "wall_s": round(time.perf_counter() - started, 3), "error": ""}
+    except Exception as error:
+        return {"status": "failed", "wall_s": round(time.perf_counter() - started, 3), "error": f"{type(error).__name__}: {error}"}
+
+
+def load_inputs(jobs):
+    """
+    Load every distinct input file once → {path: CueTable or error message}.
+    A file used by several jobs (e.g. one timing file, many languages)
+    is only parsed once.
+    """
+    inputs = {}
+    for job in jobs:
+        for path in (job["text"], job["timing"]):
+            if path in inputs:
+                continue
+            try:
+                inputs[path] = load_cues(path, encoding="utf-8")
+            except Exception as error:
+                inputs[path] = f"{type(error).__name__}: {error}"
+    return inputs
+
+
+def run_batch(jobs, base_sections, n_jobs=1, on_result=None):
+    """
+    Run every job, n_jobs at a time in a process pool, each input file
+    being loaded once. on_result(job, result) is called as jobs finish.
+    Returns results in manifest order.
+    """
+    inputs = load_inputs(jobs)
+    results = [None] * len(jobs)
+
+    def finish(i, result):
+        results[i] = result
+        if on_result is not None:
+            on_result(jobs[i], result)
+
+    runnable = []
+    for i, job in enumerate(jobs):
+        errors = [inputs[path] for path in (job["text"], job["timing"]) if isinstance(inputs[path], str)]
+        if errors:
+            finish(i, {"status": "failed", "wall_s": 0.0, "error": errors[0]})
+        else:
+            runnable.append(i)
+
+    if n_jobs <= 1:
+        for i in runnable:
+            # text cues are shifted in place: each job gets its own copy
+            finish(i, run_job(base_sections, jobs[i], inputs[jobs[i]["text"]].copy(), inputs[jobs[i]["timing"]]))
+        return results
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        futures = {
+            pool.submit(run_job, base_sections, jobs[i], inputs[jobs[i]["text"]], inputs[jobs[i]["timing"]]): i
+            for i in runnable
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as error:  # worker process died
+                result = {"status": "failed", "wall_s": 0.0, "error": f"{type(error).__name__}: {error}"}
+            finish(futures[future], result)
+    return results
@@ -1,14 +1,15 @@
-import pysrt
-
-def build_final_subs(mappings, text_subs):
+def build_final_subs(mappings, text_cues):
+    """
+    Build output items (start_ms, end_ms, text) from a MappingTable.
+    Times stay floats: the writer floors them to whole milliseconds.
+    """
     final = []
 
-    for m in mappings:
-        sub = pysrt.SubRipItem()
-        sub.index = m["text_idx"] + 1
-        sub.text = text_subs[m["text_idx"]].text
-        sub.start.seconds = m["start"]
-        sub.end.seconds = m["end"]
-        final.append(sub)
+    for text_idx, _, start, end, _ in mappings:
+        final.append((
+            start * 1000,
+            end * 1000,
+            text_cues.texts[text_idx],
+        ))
 
-    return final
\ No newline at end of file
+    return final
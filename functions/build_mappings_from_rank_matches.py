@@ -1,18 +1,19 @@
-def build_mappings_from_rank_matches(rank_matches, timing_subs):
+from functions.mapping_table import MappingTable, Origin
+
+def build_mappings_from_rank_matches(rank_matches, timing_cues, origin=Origin.RANK):
     """
-    Convert rank_matches (text_idx, time_idx) into sorted mapping objects
-    with start/end times for each timing subtitle.
+    Convert rank_matches (text_idx, time_idx) into a MappingTable sorted by
+    text_idx, with start/end times of each timing subtitle, tagged with origin.
     """
-    mappings = []
+    mappings = MappingTable()
 
-    for text_idx, time_idx in rank_matches:
-        ts = timing_subs[time_idx]
-        mappings.append({
-            "text_idx": text_idx,
-            "time_idx": time_idx,
-            "start": ts.start.ordinal / 1000,
-            "end": ts.end.ordinal / 1000,
-            "origin": "rank",
-        })
+    for text_idx, time_idx in sorted(rank_matches, key=lambda match: match[0]):
+        mappings.append(
+            text_idx,
+            time_idx,
+            timing_cues.starts[time_idx] / 1000,
+            timing_cues.ends[time_idx] / 1000,
+            origin,
+        )
 
-    return sorted(mappings, key=lambda m: m["text_idx"])
+    return mappings
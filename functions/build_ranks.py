@@ -1,43 +1,41 @@
-from tqdm import tqdm
-from functions.similarity import similarity
-from functions.time_overlap import time_overlap
+from heapq import nlargest
+from functions.score_pairs import score_pairs
 
-def build_ranks(text_source, timing_source, time_tolerance_start, time_tolerance_end, min_similarity=0.55, top_k=5):
+def build_ranks(text_source, timing_source, time_tolerance_start, time_tolerance_end, min_similarity=0.55, top_k=5, scores=None):
     """
     Build bidirectional ranks for rank-fusion matching with dynamic tolerance.
+    Both directions are read from a single sparse pair → score dict
+    (computed here unless `scores` is given).
     Returns (timing_ranks, text_ranks)
     """
 
-    n_timing = len(timing_source)
-    timing_ranks = {}
-    text_ranks = {}
-
-    for t_idx, t_sub in enumerate(tqdm(timing_source, desc="Building ranks (timing → text)", unit="sub")):
-        # dynamic tolerance increases linearly with position in video
-        progress = t_idx / max(1, n_timing - 1)
-        dynamic_tolerance = int(time_tolerance_start + progress * (time_tolerance_end - time_tolerance_start))
-
-        scored = []
-        for s_idx, s_sub in enumerate(text_source):
-            if not time_overlap(t_sub, s_sub, dynamic_tolerance):
-                continue
-            sim = similarity(s_sub.text, t_sub.text)
-            if sim >= min_similarity:
-                scored.append((s_idx, sim))
-        scored.sort(key=lambda x: x[1], reverse=True)
-        timing_ranks[t_idx] = {s_idx: rank + 1 for rank, (s_idx, _) in enumerate(scored[:top_k])}
-
-    for s_idx, s_sub in enumerate(tqdm(text_source, desc="Building ranks (text → timing)", unit="sub")):
-        scored = []
-        for t_idx, t_sub in enumerate(timing_source):
-            progress = t_idx / max(1, n_timing - 1)
-            dynamic_tolerance = int(time_tolerance_start + progress * (time_tolerance_end - time_tolerance_start))
-            if not time_overlap(t_sub, s_sub, dynamic_tolerance):
-                continue
-            sim = similarity(s_sub.text, t_sub.text)
-            if sim >= min_similarity:
-                scored.append((t_idx, sim))
-        scored.sort(key=lambda x: x[1], reverse=True)
-        text_ranks[s_idx] = {t_idx: rank + 1 for rank, (t_idx, _) in enumerate(scored[:top_k])}
+    if scores is None:
+        scores = score_pairs(text_source, timing_source, time_tolerance_start, time_tolerance_end, min_similarity)
+
+    return ranks_from_scores(scores, len(timing_source), len(text_source), top_k)
+
+
+def ranks_from_scores(scores, n_timing, n_text, top_k):
+    """
+    Keep the top_k best partners of every row, in both directions.
+    Ties keep index order, like a stable sort on similarity.
+    """
+    timing_rows = {t_idx: [] for t_idx in range(n_timing)}
+    text_rows = {s_idx: [] for s_idx in range(n_text)}
+
+    # sorted keys → each row is filled in index order
+    for t_idx, s_idx in sorted(scores):
+        sim = scores[(t_idx, s_idx)]
+        timing_rows[t_idx].append((s_idx, sim))
+        text_rows[s_idx].append((t_idx, sim))
+
+    timing_ranks = {
+        t_idx: {s_idx: rank + 1 for rank, (s_idx, _) in enumerate(nlargest(top_k, row, key=lambda x: x[1]))}
+        for t_idx, row in timing_rows.items()
+    }
+    text_ranks = {
+        s_idx: {t_idx: rank + 1 for rank, (t_idx, _) in enumerate(nlargest(top_k, row, key=lambda x: x[1]))}
+        for s_idx, row in text_rows.items()
+    }
 
     return timing_ranks, text_ranks
@@ -0,0 +1,108 @@
+from colorama import Fore
+from functions.score_pairs import score_pairs, dynamic_tolerances
+
+
+def build_scores(
+    text_source,
+    timing_source,
+    time_tolerance_start,
+    time_tolerance_end,
+    min_similarity,
+    text_store,
+    timing_store,
+    scorer="difflib",
+    workers=1,
+    candidate_mode="window",
+    lsh_num_perm=64,
+    lsh_bands=64,
+    lsh_report_recall=False,
+    scoring="pairwise",
+    vector_prefilter_k=24,
+    warp_every=10,
+    warp_margin_ms=2000,
+    warp_scorer="indel",
+    counters=None,
+):
+    """
+    Sparse {(t_idx, s_idx): similarity} dict for the selected modes:
+    - candidate_mode = "window": every pair of the time window, "lsh": only
+      LSH bucket pairs, "warp": only pairs inside narrow windows around a
+      piecewise time warp fitted on sparse first-pass anchors (LSH and warp
+      pairs are still kept within the time window)
+    - scoring = "pairwise": scorer on each candidate pair,
+      "vector" / "vector_prefilter": n-gram cosine matrix products
+    Hot-path counts are added to the counters dict when given.
+    """
+    # each mode's module (numpy for vector scoring) is imported when used
+    candidate_pairs = None
+    if candidate_mode == "lsh":
+        from functions.minhash_lsh import lsh_candidates
+        candidate_pairs = lsh_candidates(
+            text_source,
+            timing_source,
+            text_store,
+            timing_store,
+            dynamic_tolerances(len(timing_source), time_tolerance_start, time_tolerance_end),
+            lsh_num_perm,
+            lsh_bands,
+        )
+    elif candidate_mode == "warp":
+        from functions.time_warp import warp_anchors, warp_candidates
+        anchors = warp_anchors(
+            text_source,
+            timing_source,
+            text_store,
+            timing_store,
+            time_tolerance_start,
+            time_tolerance_end,
+            every=warp_every,
+            scorer=warp_scorer,
+        )
+        if counters is not None:
+            counters["warp_anchors"] = counters.get("warp_anchors", 0) + len(anchors)
+        if len(anchors) >= 2:
+            candidate_pairs = warp_candidates(text_source, timing_source, anchors, warp_margin_ms)
+            print(Fore.CYAN + f"ℹ Warp anchors    : {len(anchors)} "
+                  f"({sum(len(pairs) for pairs in candidate_pairs.values())} candidate pairs)")
+        else:
+            print(Fore.YELLOW + "⚠ Too few warp anchors, scoring the whole time window")
+
+    def score_candidates(candidate_pairs, counters=None):
+        if scoring != "pairwise":
+            from functions.vector_scores import vector_score_pairs
+            return vector_score_pairs(
+                text_source,
+                timing_source,
+                time_tolerance_start,
+                time_tolerance_end,
+                min_similarity,
+                text_store,
+                timing_store,
+                prefilter_k=vector_prefilter_k if scoring == "vector_prefilter" else None,
+                scorer=scorer,
+                candidate_pairs=candidate_pairs,
+                counters=counters,
+            )
+        return score_pairs(
+            text_source,
+            timing_source,
+            time_tolerance_start,
+            time_tolerance_end,
+            min_similarity,
+            text_store=text_store,
+            timing_store=timing_store,
+            scorer=scorer,
+            workers=workers,
+            candidate_pairs=candidate_pairs,
+            counters=counters,
+        )
+
+    scores = score_candidates(candidate_pairs, counters)
+
+    if candidate_pairs is not None and lsh_report_recall:
+        from functions.minhash_lsh import pair_recall
+        reference = score_candidates(None)
+        print(Fore.CYAN + f"ℹ {candidate_mode.upper() + ' pair recall':<16}: {pair_recall(scores, reference):.3f} "
+              f"({len(scores)}/{len(reference)} pairs)")
+
+    return scores
@@ -0,0 +1,64 @@
+from bisect import bisect_left, bisect_right
+
+# cues longer than this (and than 99% of the file) are indexed apart, so one
+# malformed long cue cannot widen every query's lookback (see build_time_index_ms)
+LONG_CUE_MS = 10000
+
+
+def build_time_index(cues):
+    """
+    Sort the subtitles of a CueTable by start time once so the ones close
+    to a time window can be found with bisect instead of scanning the whole file.
+    """
+    return build_time_index_ms(cues.starts, cues.ends)
+
+
+def build_time_index_ms(starts_ms, ends_ms):
+    """
+    Same as build_time_index, from plain start/end arrays in milliseconds.
+    A query looks back by the longest indexed cue, so the few cues longer
+    than LONG_CUE_MS and the 99th percentile duration (OCR dumps often hold
+    one cue spanning minutes) are kept in a separate list checked one by one.
+    """
+    durations = sorted(e - s for s, e in zip(starts_ms, ends_ms))
+    long_ms = max(LONG_CUE_MS, durations[int(len(durations) * 0.99)] if durations else 0)
+    order = sorted(
+        (i for i in range(len(starts_ms)) if ends_ms[i] - starts_ms[i] <= long_ms),
+        key=lambda i: starts_ms[i],
+    )
+    long_cues = [
+        (starts_ms[i], ends_ms[i], i) for i in range(len(starts_ms)) if ends_ms[i] - starts_ms[i] > long_ms
+    ]
+
+    return {
+        "order": order,
+        "starts": [starts_ms[i] for i in order],
+        "ends": [ends_ms[i] for i in order],
+        # longest indexed cue bounds how early a cue can start and still reach the window
+        "max_duration": max((ends_ms[i] - starts_ms[i] for i in order), default=0),
+        "long": long_cues,
+    }
+
+
+def query_time_index(index, start_ms, end_ms, tolerance_ms, counters=None):
+    """
+    Return indexes (in file order) of subtitles overlapping
+    [start_ms - tolerance_ms, end_ms + tolerance_ms].
+    Same rule as time_overlap. counters["pairs_considered"] counts the
+    subtitles the bisect range (and the long cue list) had to check.
+    """
+    window_start = start_ms - tolerance_ms
+    window_end = end_ms + tolerance_ms
+
+    starts = index["starts"]
+    ends = index["ends"]
+    order = index["order"]
+
+    lo = bisect_left(starts, window_start - max(index["max_duration"], 0))
+    hi = bisect_right(starts, window_end)
+    if counters is not None:
+        counters["pairs_considered"] += hi - lo + len(index["long"])
+
+    found = [order[k] for k in range(lo, hi) if ends[k] >= window_start]
+    found.extend(i for start, end, i in index["long"] if end >= window_start and start <= window_end)
+    return sorted(found)
@@ -0,0 +1,28 @@
+from array import array
+
+
+class CueTable:
+    """
+    Compact subtitle table built once at load time:
+    start / end in milliseconds (int64 arrays) and the raw text of each cue.
+    Every stage works on it, from reading (functions/srt_stream.py) to writing.
+    """
+
+    __slots__ = ("starts", "ends", "texts")
+
+    def __init__(self, starts=(), ends=(), texts=()):
+        self.starts = array("q", starts)
+        self.ends = array("q", ends)
+        self.texts = list(texts)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def copy(self):
+        return CueTable(self.starts, self.ends, self.texts)
+
+    def __getstate__(self):
+        return (self.starts, self.ends, self.texts)
+
+    def __setstate__(self, state):
+        self.starts, self.ends, self.texts = state
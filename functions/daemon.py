@@ -0,0 +1,272 @@
+import configparser
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import urllib.request
+from collections import deque
+from contextlib import redirect_stderr, redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from functions.rank_cache import MemoryRankCache
+from functions.reconcile_from_config import reconcile_from_config
+from functions.text_store import TextStoreCache
+from functions.worker_pool import set_warm_pool
+
+# config keys holding paths, made absolute by the client (the daemon has its own cwd)
+PATH_KEYS = {
+    "files": ("text_source", "timing_source", "output"),
+    "multi_source": ("timing_sources",),
+    "incremental": ("state",),
+    "cache": ("directory",),
+}
+
+
+def _warm_up(_):
+    """Start a pool process and import the scoring code in it"""
+    import functions.score_pairs  # noqa: F401
+    return os.getpid()
+
+
+class _EventWriter:
+    """Console sink of a running job: every line written becomes an event"""
+
+    def __init__(self, events):
+        self.events = events
+        self._buffer = ""
+
+    def write(self, text):
+        self._buffer += text
+        while True:
+            cuts = [pos for pos in (self._buffer.find("\n"), self._buffer.find("\r")) if pos >= 0]
+            if not cuts:
+                break
+            cut = min(cuts)
+            line, separator, self._buffer = self._buffer[:cut], self._buffer[cut], self._buffer[cut + 1:]
+            if line.strip():
+                # tqdm redraws its bar with \r
+                self.events.put({"event": "progress" if separator == "\r" else "log", "line": line})
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+class _Job:
+    __slots__ = ("sections", "events", "submitted")
+
+    def __init__(self, sections):
+        self.sections = sections
+        self.events = queue.Queue()
+        self.submitted = time.perf_counter()
+
+
+def _distribution(values):
+    ordered = sorted(values)
+    if not ordered:
+        return {"count": 0}
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)],
+    }
+
+
+class ReconcileDaemon:
+    """
+    Long-running reconciliation service state: a queue of jobs (config
+    sections, as in config.ini) run one at a time by a background thread,
+    a warm process pool for pair scoring, and the TextStore and rank
+    caches kept across jobs with LRU eviction.
+    Console output of the running job is turned into events on its queue.
+    """
+
+    def __init__(self, workers=2, text_cache_entries=32, rank_cache_entries=64, history=1000):
+        self.workers = workers
+        self.jobs = queue.Queue()
+        self.text_stores = TextStoreCache(text_cache_entries)
+        self.rank_cache = MemoryRankCache(rank_cache_entries)
+        self.pool = None
+        self.started = time.time()
+        self.running = 0
+        self.done = 0
+        self.failed = 0
+        # seconds spent queued and total (queued + running), last `history` jobs
+        self.queue_wait = deque(maxlen=history)
+        self.latency = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self.workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+            list(self.pool.map(_warm_up, range(self.workers)))
+            set_warm_pool(self.pool)
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        self.jobs.put(None)
+        if self.pool is not None:
+            set_warm_pool(None)
+            self.pool.shutdown()
+
+    def submit(self, sections):
+        job = _Job(sections)
+        self.jobs.put(job)
+        return job
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            self._run_job(job)
+
+    def _run_job(self, job):
+        started = time.perf_counter()
+        self.running = 1
+        writer = _EventWriter(job.events)
+        try:
+            config = configparser.ConfigParser()
+            config.read_dict(job.sections)
+            if not config.has_section("performance"):
+                config.add_section("performance")
+            # pair scoring runs on the warm pool
+            config["performance"]["workers"] = str(self.workers)
+            with redirect_stdout(writer), redirect_stderr(writer):
+                summary = reconcile_from_config(config, rank_cache=self.rank_cache, text_stores=self.text_stores)
+        except Exception as error:
+            self.failed += 1
+            job.events.put({"event": "error", "error": f"{type(error).__name__}: {error}"})
+        else:
+            self.done += 1
+            finished = time.perf_counter()
+            job.events.put({
+                "event": "summary",
+                "summary": summary,
+                "queue_ms": (started - job.submitted) * 1000,
+                "run_ms": (finished - started) * 1000,
+            })
+        finally:
+            self.running = 0
+            with self._lock:
+                self.queue_wait.append(started - job.submitted)
+                self.latency.append(time.perf_counter() - job.submitted)
+            job.events.put(None)
+
+    def metrics(self):
+        with self._lock:
+            queue_wait, latency = list(self.queue_wait), list(self.latency)
+        return {
+            "uptime_s": time.time() - self.started,
+            "workers": self.workers,
+            "queue_depth": self.jobs.qsize(),
+            "running": self.running,
+            "jobs_done": self.done,
+            "jobs_failed": self.failed,
+            "queue_wait_ms": _distribution(value * 1000 for value in queue_wait),
+            "latency_ms": _distribution(value * 1000 for value in latency),
+            "text_cache": self.text_stores.stats(),
+            "rank_cache": self.rank_cache.stats(),
+        }
+
+
+def make_server(daemon, host="127.0.0.1", port=8765):
+    """
+    Local HTTP front end of a ReconcileDaemon:
+    POST /reconcile  {"config": {section: {key: value}}} → one JSON event
+                     per line (queued, log, progress, then summary or error)
+    GET  /metrics    queue depth, job counts, latency, cache stats
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/metrics":
+                self._send_json(200, daemon.metrics())
+            else:
+                self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+        def do_POST(self):
+            if self.path != "/reconcile":
+                self._send_json(404, {"error": f"Unknown path {self.path}"})
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                sections = request["config"]
+                if not all(isinstance(values, dict) for values in sections.values()):
+                    raise TypeError("config must map sections to {key: value}")
+            except (ValueError, KeyError, TypeError, AttributeError) as error:
+                self._send_json(400, {"error": f"Bad job: {error}"})
+                return
+
+            job = daemon.submit(sections)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            event = {"event": "queued", "queue_depth": daemon.jobs.qsize()}
+            client_gone = False
+            while event is not None:
+                if not client_gone:
+                    try:
+                        self.wfile.write((json.dumps(event, default=str) + "\n").encode("utf-8"))
+                        self.wfile.flush()
+                    except OSError:
+                        client_gone = True  # the job still runs and fills the caches
+                event = job.events.get()
+
+        def log_message(self, format, *args):
+            # sys.stderr may be redirected to the running job
+            sys.__stderr__.write(f"{self.address_string()} {format % args}\n")
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+# ─────────────── Client side ───────────────
+
+def client_sections(config, base_dir="."):
+    """ConfigParser → job sections, with paths made absolute from base_dir"""
+    sections = {section: dict(config[section]) for section in config.sections()}
+    for section, keys in PATH_KEYS.items():
+        for key in keys:
+            value = sections.get(section, {}).get(key, "")
+            if value.strip():
+                sections[section][key] = ", ".join(
+                    os.path.abspath(os.path.join(base_dir, path.strip())) for path in value.split(",") if path.strip()
+                )
+    return sections
+
+
+def submit_job(url, sections, on_event=None):
+    """POST a job to a daemon, calling on_event for each event → last event (summary or error)"""
+    request = urllib.request.Request(
+        url.rstrip("/") + "/reconcile",
+        data=json.dumps({"config": sections}).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    event = None
+    with urllib.request.urlopen(request) as response:
+        for line in response:
+            event = json.loads(line)
+            if on_event is not None:
+                on_event(event)
+    return event
+
+
+def fetch_metrics(url):
+    with urllib.request.urlopen(url.rstrip("/") + "/metrics") as response:
+        return json.loads(response.read())
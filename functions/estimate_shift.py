@@ -0,0 +1,197 @@
+import math
+from functions.build_time_index import build_time_index, query_time_index
+from functions.scorers import get_scorer
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+# without numpy the correlation is computed directly, on coarser bins
+PURE_PYTHON_BIN_MS = 1000
+
+
+def activity_timeline(starts, ends, origin_ms, bin_ms, n_bins):
+    """Speech activity per bin_ms bin from origin_ms: 1.0 where a cue covers the bin"""
+    timeline = [0.0] * n_bins
+    for start, end in zip(starts, ends):
+        lo = max((start - origin_ms) // bin_ms, 0)
+        hi = min((end - origin_ms) // bin_ms + 1, n_bins)
+        for b in range(lo, hi):
+            timeline[b] = 1.0
+    return timeline
+
+
+def best_lag(text_timeline, timing_timeline, max_lag):
+    """
+    Lag L in [-max_lag, max_lag] (bins) maximizing
+    sum(text[i] * timing[i + L]), and that peak value.
+    """
+    if np is not None:
+        a = np.asarray(text_timeline, dtype=np.float64)
+        b = np.asarray(timing_timeline, dtype=np.float64)
+        size = 1 << (len(a) + len(b)).bit_length()
+        corr = np.fft.irfft(np.conj(np.fft.rfft(a, size)) * np.fft.rfft(b, size), size)
+        lags = np.arange(-max_lag, max_lag + 1)
+        values = corr[lags % size]
+        best = int(np.argmax(values))
+        # overlaps are whole bins: rounding drops FFT noise (no overlap → 0.0)
+        return int(lags[best]), float(round(values[best]))
+
+    active = [i for i, value in enumerate(text_timeline) if value]
+    n = len(timing_timeline)
+    best = (0, -1.0)
+    for lag in range(-max_lag, max_lag + 1):
+        value = sum(timing_timeline[i + lag] for i in active if 0 <= i + lag < n)
+        # prefer the smaller shift on ties
+        if value > best[1] or (value == best[1] and abs(lag) < abs(best[0])):
+            best = (lag, value)
+    return best
+
+
+def fit_line(xs, ys):
+    """Least squares y = a + b * x → (a, b); flat line through the mean if x does not vary"""
+    n = len(xs)
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return mean_y, 0.0
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+    return mean_y - slope * mean_x, slope
+
+
+def correlate_offsets(text_cues, timing_cues, bin_ms=100, max_offset_ms=300_000, segments=4):
+    """
+    Offset (timing − text, ms) at the center of each of `segments` equal
+    parts of the text file, from cross-correlating speech activity.
+    → list of (center_ms, offset_ms, weight)
+    """
+    if np is None:
+        bin_ms = max(bin_ms, PURE_PYTHON_BIN_MS)
+
+    origin = min(text_cues.starts[0], timing_cues.starts[0]) - max_offset_ms
+    end = max(max(text_cues.ends), max(timing_cues.ends)) + max_offset_ms
+    n_bins = (end - origin) // bin_ms + 1
+    max_lag = max_offset_ms // bin_ms
+    timing_timeline = activity_timeline(timing_cues.starts, timing_cues.ends, origin, bin_ms, n_bins)
+
+    first, last = text_cues.starts[0], text_cues.ends[-1]
+    span = max(last - first, 1)
+    offsets = []
+    for segment in range(segments):
+        lo = first + span * segment // segments
+        hi = first + span * (segment + 1) // segments
+        idxs = [i for i, start in enumerate(text_cues.starts) if lo <= start < hi or (segment == segments - 1 and start == hi)]
+        if not idxs:
+            continue
+        text_timeline = activity_timeline(
+            [text_cues.starts[i] for i in idxs], [text_cues.ends[i] for i in idxs], origin, bin_ms, n_bins
+        )
+        active = sum(text_timeline)
+        lag, peak = best_lag(text_timeline, timing_timeline, max_lag)
+        # weight: share of the segment's speech that lines up at the best lag
+        offsets.append(((lo + hi) / 2, lag * bin_ms, peak / active if active else 0.0))
+    return offsets
+
+
+def anchor_offsets(text_cues, timing_cues, text_store, timing_store, offset_at,
+                   window_ms=2000, min_similarity=0.9, sample=500, scorer="difflib"):
+    """
+    Cheap high-confidence anchors: a sample of text cues, each compared only
+    with timing cues near its predicted time, kept when one timing cue
+    matches clearly better than the rest.
+    → list of (text_start_ms, timing_start_ms − text_start_ms)
+    """
+    score = get_scorer(scorer)
+    index = build_time_index(timing_cues)
+    step = max(len(text_cues) // sample, 1)
+
+    anchors = []
+    for s_idx in range(0, len(text_cues), step):
+        start, end = text_cues.starts[s_idx], text_cues.ends[s_idx]
+        shift = offset_at(start)
+        text = text_store.normalized(s_idx)
+        ranked = sorted(
+            (score(text, timing_store.normalized(t_idx)), t_idx)
+            for t_idx in query_time_index(index, start + shift, end + shift, window_ms)
+        )
+        if not ranked or ranked[-1][0] < min_similarity:
+            continue
+        if len(ranked) > 1 and ranked[-2][0] > ranked[-1][0] - 0.1:
+            continue
+        anchors.append((start, timing_cues.starts[ranked[-1][1]] - start))
+    return anchors
+
+
+def estimate_shift(
+    text_cues,
+    timing_cues,
+    text_store,
+    timing_store,
+    bin_ms=100,
+    max_offset_ms=300_000,
+    min_tolerance_ms=2000,
+    scorer="difflib",
+):
+    """
+    Estimate the linear shift that puts the text file on the timing clock,
+    and the time tolerance that is still needed after applying it.
+
+    1. Bin each file's cue coverage into a speech-activity timeline and
+       cross-correlate (FFT with numpy) per segment of the text file; a
+       line through the segment offsets gives offset and drift.
+    2. Refine that line from a few cheap high-confidence text anchors
+       found near their predicted time.
+    3. Tolerance = 4 × the 95th percentile anchor residual, at least
+       min_tolerance_ms (None when too few anchors to tell).
+
+    Returns shift_start_ms / shift_end_ms in apply_time_shift_linear's
+    terms, plus offset_ms, drift_ms_per_hour, anchors and tolerance_ms.
+    """
+    no_estimate = {"shift_start_ms": 0, "shift_end_ms": 0, "offset_ms": 0,
+                   "drift_ms_per_hour": 0.0, "anchors": 0, "tolerance_ms": None}
+    if not len(text_cues) or not len(timing_cues):
+        return no_estimate
+
+    # ─────────────── 1. Activity cross-correlation ───────────────
+    segments = correlate_offsets(text_cues, timing_cues, bin_ms, max_offset_ms)
+    if not segments:
+        return no_estimate
+    global_lag = max(segments, key=lambda item: item[2])[1]
+    # segments that disagree wildly with the best one are dropped
+    trusted = [item for item in segments if abs(item[1] - global_lag) <= max_offset_ms / 10 and item[2] > 0]
+    if not trusted:
+        # no speech lines up at any lag (sparse or very short files)
+        return no_estimate
+    offset, drift = fit_line([item[0] for item in trusted], [item[1] for item in trusted])
+
+    # ─────────────── 2. Anchor refinement ───────────────
+    window_ms = max(4 * bin_ms if np is not None else PURE_PYTHON_BIN_MS, 2000)
+    anchors = anchor_offsets(
+        text_cues, timing_cues, text_store, timing_store,
+        lambda t: offset + drift * t, window_ms=window_ms, scorer=scorer,
+    )
+    tolerance_ms = None
+    if len(anchors) >= 3:
+        xs, ys = [a[0] for a in anchors], [a[1] for a in anchors]
+        offset, drift = fit_line(xs, ys)
+        residuals = sorted(abs(y - (offset + drift * x)) for x, y in zip(xs, ys))
+        # one trimmed refit against stray anchors
+        limit = max(3 * residuals[len(residuals) // 2], bin_ms)
+        kept = [(x, y) for x, y in zip(xs, ys) if abs(y - (offset + drift * x)) <= limit]
+        if len(kept) >= 3:
+            offset, drift = fit_line([x for x, _ in kept], [y for _, y in kept])
+            residuals = sorted(abs(y - (offset + drift * x)) for x, y in kept)
+        p95 = residuals[min(int(len(residuals) * 0.95), len(residuals) - 1)]
+        tolerance_ms = max(min_tolerance_ms, int(math.ceil(4 * p95 / 100.0)) * 100)
+
+    # ─────────────── 3. In apply_time_shift_linear terms ───────────────
+    first, last = text_cues.starts[0], text_cues.ends[-1]
+    return {
+        "shift_start_ms": int(round(offset + drift * first)),
+        "shift_end_ms": int(round(offset + drift * last)),
+        "offset_ms": int(round(offset + drift * first)),
+        "drift_ms_per_hour": drift * 3600_000,
+        "anchors": len(anchors),
+        "tolerance_ms": tolerance_ms,
+    }
@@ -0,0 +1,104 @@
+from functions.mapping_table import MappingTable, Origin
+
+
+def fill_and_spread(anchors, text_cues, timing_cues):
+    """
+    Gap filling and linear spread in one left-to-right sweep over the
+    anchors (MappingTable sorted by text_idx). For each segment:
+    - text and timing progress together → fill with timing ("gap")
+    - otherwise → spread the text evenly between the anchors ("spread")
+    Before the first and after the last anchor, text is spread over a 10s
+    window. Rows are appended in text order, no sort or insertion needed.
+    """
+    out = MappingTable()
+    if not len(anchors):
+        return out
+
+    text_idx, time_idx, start, end, origin = anchors.columns()
+
+    # ───────────────────────────────
+    # BEFORE FIRST ANCHOR
+    # ───────────────────────────────
+    t1 = start[0]
+    t0 = max(t1 - 10.0, 0.0)  # 10s fallback window
+    spread_segment(out, 0, text_idx[0], t0, t1, text_cues)
+
+    # ───────────────────────────────
+    # BETWEEN ANCHORS
+    # ───────────────────────────────
+    for left in range(len(anchors) - 1):
+        right = left + 1
+        out.append(text_idx[left], time_idx[left], start[left], end[left], origin[left])
+
+        dt = text_idx[right] - text_idx[left]
+        ds = time_idx[right] - time_idx[left]
+
+        if dt > 1 and dt == ds:
+            fill_segment(out, text_idx[left], time_idx[left], dt, timing_cues)
+        elif dt > 1:
+            spread_segment(out, text_idx[left] + 1, text_idx[right], end[left], start[right], text_cues)
+
+    # ───────────────────────────────
+    # AFTER LAST ANCHOR
+    # ───────────────────────────────
+    last = len(anchors) - 1
+    out.append(text_idx[last], time_idx[last], start[last], end[last], origin[last])
+    t0 = end[last]
+    spread_segment(out, text_idx[last] + 1, len(text_cues), t0, t0 + 10.0, text_cues, clamp=False)
+
+    return out
+
+
+def fill_segment(out, left_text_idx, left_time_idx, dt, timing_cues):
+    """Map text and timing one-to-one between two anchors ("gap")"""
+    for i in range(1, dt):
+        s_idx = left_time_idx + i
+        out.append(
+            left_text_idx + i,
+            s_idx,
+            timing_cues.starts[s_idx] / 1000,
+            timing_cues.ends[s_idx] / 1000,
+            Origin.GAP,
+        )
+
+
+def spread_segment(out, first_idx, stop_idx, t0, t1, text_cues, clamp=True):
+    """
+    Spread text cues first_idx .. stop_idx-1 over [t0, t1], keeping their
+    relative durations and gaps ("spread"). With clamp, no line ends past t1.
+    """
+    if first_idx >= stop_idx:
+        return
+
+    available = max(t1 - t0, 0.001)
+
+    durations = []
+    gaps = []
+    for text_idx in range(first_idx, stop_idx):
+        durations.append(max(
+            (text_cues.ends[text_idx] - text_cues.starts[text_idx]) / 1000,
+            0.001
+        ))
+        if text_idx < stop_idx - 1:
+            gaps.append(max(
+                (text_cues.starts[text_idx + 1] - text_cues.ends[text_idx]) / 1000,
+                0.0
+            ))
+
+    original_total = sum(durations) + sum(gaps)
+    if original_total <= 0:
+        return
+
+    scale = available / original_total
+
+    cursor = t0
+    for i, text_idx in enumerate(range(first_idx, stop_idx)):
+        dur = durations[i] * scale
+        start = cursor
+        end = min(start + dur, t1 - 0.001) if clamp else start + dur
+
+        out.append(text_idx, None, start, end, Origin.SPREAD)
+
+        cursor = end
+        if i < len(gaps):
+            cursor += gaps[i] * scale
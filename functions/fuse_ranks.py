@@ -0,0 +1,16 @@
+def fuse_ranks(timing_ranks, text_ranks, max_avg_rank=3.0):
+    """
+    Keep pairs ranked by both directions and fuse their ranks.
+    Returns candidates (avg_rank, text_idx, time_idx) sorted by avg_rank.
+    """
+    candidates = []
+    for t_idx, s_ranks in timing_ranks.items():
+        for s_idx, r1 in s_ranks.items():
+            if t_idx not in text_ranks.get(s_idx, {}):
+                continue
+            r2 = text_ranks[s_idx][t_idx]
+            avg = (r1 + r2) / 2
+            if avg <= max_avg_rank:
+                candidates.append((avg, s_idx, t_idx))
+    candidates.sort(key=lambda x: x[0])
+    return candidates
@@ -0,0 +1,143 @@
+import difflib
+import hashlib
+import json
+import os
+import pickle
+from colorama import Fore
+from functions.build_time_index import build_time_index, query_time_index
+from functions.rank_cache import cue_table_digest
+from functions.score_pairs import score_pairs
+
+STATE_VERSION = 1
+
+
+def scores_state_key(timing_cues, params):
+    """Timing file plus every setting a pair score depends on"""
+    digest = hashlib.sha256()
+    digest.update(cue_table_digest(timing_cues).encode())
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def load_state(path):
+    """Previous run's state dict, or None if missing, unreadable or outdated"""
+    try:
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        return None
+    return state
+
+
+def save_state(path, key, text_cues, scores):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump({
+            "version": STATE_VERSION,
+            "key": key,
+            "text_rows": list(zip(text_cues.starts, text_cues.ends, text_cues.texts)),
+            "scores": scores,
+        }, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def diff_text_cues(old_rows, text_cues):
+    """
+    Match the previous text cues (start, end, text) against the new ones.
+    Returns ({old s_idx: new s_idx} for unchanged cues, [new s_idx] of
+    edited or inserted cues).
+    """
+    new_rows = list(zip(text_cues.starts, text_cues.ends, text_cues.texts))
+    matcher = difflib.SequenceMatcher(None, old_rows, new_rows, autojunk=False)
+    moved = {}
+    for old_start, new_start, size in matcher.get_matching_blocks():
+        for offset in range(size):
+            moved[old_start + offset] = new_start + offset
+    kept = set(moved.values())
+    return moved, [s_idx for s_idx in range(len(new_rows)) if s_idx not in kept]
+
+
+def incremental_scores(
+    state_file,
+    text_source,
+    timing_source,
+    time_tolerance_start,
+    time_tolerance_end,
+    min_similarity,
+    text_store,
+    timing_store,
+    scorer="difflib",
+    workers=1,
+    counters=None,
+):
+    """
+    Same dict as score_pairs, reusing the previous run's scores from
+    state_file: a pair's score only depends on its two cues and the
+    timing cue's tolerance, so pairs of unchanged text cues are carried
+    over (re-indexed) and only edited or inserted cues are scored, within
+    their time window. The new state is written back.
+    Without a usable state (first run, other timing file or settings)
+    every pair is scored.
+    """
+    key = scores_state_key(timing_source, {
+        "time_tolerance_start": time_tolerance_start,
+        "time_tolerance_end": time_tolerance_end,
+        "min_similarity": min_similarity,
+        "scorer": scorer,
+    })
+    state = load_state(state_file)
+
+    if state is None or state["key"] != key:
+        scores = score_pairs(
+            text_source,
+            timing_source,
+            time_tolerance_start,
+            time_tolerance_end,
+            min_similarity,
+            text_store=text_store,
+            timing_store=timing_store,
+            scorer=scorer,
+            workers=workers,
+            counters=counters,
+        )
+    else:
+        moved, changed = diff_text_cues(state["text_rows"], text_source)
+        scores = {
+            (t_idx, moved[s_idx]): sim
+            for (t_idx, s_idx), sim in state["scores"].items()
+            if s_idx in moved
+        }
+        print(Fore.CYAN + f"ℹ Incremental     : {len(changed)} of {len(text_source)} text cues re-scored")
+
+        if changed:
+            # widest tolerance finds every timing cue that may be in window;
+            # score_pairs then applies each cue's own tolerance
+            index = build_time_index(timing_source)
+            widest = max(time_tolerance_start, time_tolerance_end)
+            candidate_pairs = {}
+            for s_idx in changed:
+                for t_idx in query_time_index(index, text_source.starts[s_idx], text_source.ends[s_idx], widest):
+                    candidate_pairs.setdefault(t_idx, set()).add(s_idx)
+            scores.update(score_pairs(
+                text_source,
+                timing_source,
+                time_tolerance_start,
+                time_tolerance_end,
+                min_similarity,
+                text_store=text_store,
+                timing_store=timing_store,
+                scorer=scorer,
+                workers=workers,
+                candidate_pairs=candidate_pairs,
+                counters=counters,
+            ))
+        # same iteration order as a full pass, so ties rank identically
+        scores = dict(sorted(scores.items()))
+
+    save_state(state_file, key, text_source, scores)
+    return scores
@@ -0,0 +1,61 @@
+from array import array
+from enum import IntEnum
+
+
+class Origin(IntEnum):
+    """Where a mapping comes from; written as "{\\ O (name)}" in the output"""
+    RANK = 0
+    GAP = 1
+    SPREAD = 2
+    ALIGN = 3
+
+    def __str__(self):
+        return self.name.lower()
+
+
+# time_idx of rows without a timing subtitle (spread)
+NO_TIME = -1
+
+
+class MappingTable:
+    """
+    Struct-of-arrays table of text → time mappings, one row per text line:
+    text_idx / time_idx (int64), start / end in seconds (float64) and
+    origin (one byte). Replaces the per-line dicts of earlier versions.
+    """
+
+    __slots__ = ("text_idx", "time_idx", "start", "end", "origin")
+
+    def __init__(self):
+        self.text_idx = array("q")
+        self.time_idx = array("q")
+        self.start = array("d")
+        self.end = array("d")
+        self.origin = bytearray()
+
+    def __len__(self):
+        return len(self.text_idx)
+
+    def append(self, text_idx, time_idx, start, end, origin):
+        self.text_idx.append(text_idx)
+        self.time_idx.append(NO_TIME if time_idx is None else time_idx)
+        self.start.append(start)
+        self.end.append(end)
+        self.origin.append(origin)
+
+    def columns(self, lo=0, hi=None):
+        """Zero-copy views (text_idx, time_idx, start, end, origin) of rows lo..hi-1"""
+        hi = len(self) if hi is None else hi
+        return tuple(memoryview(column)[lo:hi] for column in (
+            self.text_idx, self.time_idx, self.start, self.end, self.origin
+        ))
+
+    def __iter__(self):
+        """Rows as (text_idx, time_idx or None, start, end, Origin)"""
+        for text_idx, time_idx, start, end, origin in zip(
+            self.text_idx, self.time_idx, self.start, self.end, self.origin
+        ):
+            yield text_idx, (None if time_idx == NO_TIME else time_idx), start, end, Origin(origin)
+
+    def count(self, origin):
+        return self.origin.count(origin)
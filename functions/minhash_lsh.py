@@ -0,0 +1,105 @@
+import zlib
+from functions.build_time_index import build_time_index, query_time_index
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+# Mersenne prime for the universal hash family (a * x + b) mod p, small
+# enough for a * x + b to fit in uint64 when numpy computes the signatures
+_PRIME = (1 << 31) - 1
+
+
+def _hash_params(num_perm, seed=1):
+    """Deterministic (a, b) pairs, identical in every process"""
+    params = []
+    state = seed
+    for _ in range(num_perm):
+        state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+        a = state % (_PRIME - 1) + 1
+        state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+        b = state % _PRIME
+        params.append((a, b))
+    return params
+
+
+def _shingle_hashes(shingles):
+    # crc32 instead of hash(): str hashes are salted per process
+    return [zlib.crc32(s.encode("utf-8")) for s in shingles]
+
+
+def minhash_signature(shingles, params):
+    """MinHash signature of a set of string shingles"""
+    if not shingles:
+        return None
+    hashed = _shingle_hashes(shingles)
+    return tuple(min((a * h + b) % _PRIME for h in hashed) for a, b in params)
+
+
+def band_keys(store, params, bands, shingle_size=3):
+    """
+    LSH bucket keys (band, rows of the signature) of every cue of store,
+    as a frozenset per cue (empty for cues without shingles). numpy, when
+    installed, computes the same signatures in one product per cue.
+    """
+    rows = max(1, len(params) // bands)
+    if np is not None:
+        a = np.array([a for a, _ in params], dtype=np.uint64)[:, None]
+        b = np.array([b for _, b in params], dtype=np.uint64)[:, None]
+    keys = []
+    for idx in range(len(store)):
+        shingles = store.ngrams(idx, shingle_size)
+        if not shingles:
+            keys.append(frozenset())
+            continue
+        if np is not None:
+            hashed = np.array(_shingle_hashes(shingles), dtype=np.uint64)
+            signature = tuple(((a * hashed + b) % _PRIME).min(axis=1).tolist())
+        else:
+            signature = minhash_signature(shingles, params)
+        keys.append(frozenset((band, signature[band * rows:(band + 1) * rows]) for band in range(bands)))
+    return keys
+
+
+def lsh_candidates(
+    text_source,
+    timing_source,
+    text_store,
+    timing_store,
+    tolerances,
+    num_perm=64,
+    bands=64,
+    shingle_size=3,
+):
+    """
+    Pairs inside the time window (tolerances[t_idx], as score_pairs) that
+    share at least one LSH bucket of character-shingle MinHash signatures.
+    Each timing cue looks up its window in the text time index first and
+    only then compares buckets, so the cost follows the window pairs, not
+    the bucket sizes. Returns {t_idx: set(s_idx)}.
+    """
+    rows = max(1, num_perm // bands)
+    params = _hash_params(rows * bands)
+    text_keys = band_keys(text_store, params, bands, shingle_size)
+    timing_keys = band_keys(timing_store, params, bands, shingle_size)
+    text_index = build_time_index(text_source)
+
+    candidates = {}
+    for t_idx, keys in enumerate(timing_keys):
+        if not keys:
+            continue
+        window = query_time_index(
+            text_index, timing_source.starts[t_idx], timing_source.ends[t_idx], tolerances[t_idx]
+        )
+        shared = {s_idx for s_idx in window if not keys.isdisjoint(text_keys[s_idx])}
+        if shared:
+            candidates[t_idx] = shared
+    return candidates
+
+
+def pair_recall(scores, reference_scores):
+    """Share of the reference (brute-force) pairs also found in scores"""
+    if not reference_scores:
+        return 1.0
+    return sum(pair in scores for pair in reference_scores) / len(reference_scores)
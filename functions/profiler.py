@@ -0,0 +1,86 @@
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def max_rss_mb():
+    """Peak resident set size of the process so far, None where unavailable"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+class Profiler:
+    """
+    Wall time of each pipeline stage and the process peak RSS after it,
+    plus hot-path counters (pairs considered, similarity calls, ...).
+    A disabled profiler (the default) records nothing and costs nothing.
+
+    trace_memory traces every allocation with tracemalloc to get the peak
+    memory of each stage. It slows the pipeline down several times, so
+    stage times are then left out of the report: take them from a run
+    without it.
+    """
+
+    def __init__(self, enabled=False, trace_memory=False):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.stages = {}
+        self.counters = {}
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            record = self.stages.setdefault(name, {"calls": 0})
+            record["calls"] += 1
+            if self.trace_memory:
+                peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                record["peak_mb"] = max(record.get("peak_mb", 0.0), peak_mb)
+            else:
+                record["wall_s"] = record.get("wall_s", 0.0) + elapsed
+                rss_mb = max_rss_mb()
+                if rss_mb is not None:
+                    record["max_rss_mb"] = rss_mb
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge_counters(self, counters):
+        for name, n in counters.items():
+            self.count(name, n)
+
+    def report(self):
+        report = {"stages": self.stages, "counters": self.counters}
+        if self.trace_memory:
+            report["trace_memory"] = True
+        else:
+            report["total_wall_s"] = sum(record["wall_s"] for record in self.stages.values())
+        return report
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
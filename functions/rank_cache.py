@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import zlib
+from array import array
+from collections import OrderedDict
+
+MAGIC = b"SRK1"
+
+
+def cue_table_digest(cues):
+    """sha256 of a CueTable's times and text (after any shift)"""
+    digest = hashlib.sha256()
+    digest.update(cues.starts.tobytes())
+    digest.update(cues.ends.tobytes())
+    for text in cues.texts:
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def rank_cache_key(text_cues, timing_cues, params):
+    """Content address: both cue tables plus every setting that affects ranking"""
+    digest = hashlib.sha256()
+    digest.update(cue_table_digest(text_cues).encode())
+    digest.update(cue_table_digest(timing_cues).encode())
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def _encode_ranks(ranks):
+    """{row: {col: rank}} → flat int32 (row, col, rank) triples"""
+    flat = array("i")
+    for row, cols in ranks.items():
+        for col, rank in cols.items():
+            flat.extend((row, col, rank))
+    return flat.tobytes()
+
+
+def _decode_ranks(data, n_rows):
+    flat = array("i")
+    flat.frombytes(data)
+    ranks = {row: {} for row in range(n_rows)}
+    for i in range(0, len(flat), 3):
+        ranks[flat[i]][flat[i + 1]] = flat[i + 2]
+    return ranks
+
+
+class RankCache:
+    """
+    On-disk cache of (timing_ranks, text_ranks), one compressed binary file
+    per key, evicted least-recently-used once the directory exceeds max_mb.
+    """
+
+    def __init__(self, directory, max_mb=200):
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.ranks")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            return None
+        if data[:4] != MAGIC:
+            return None
+
+        n_timing, n_text, timing_size = struct.unpack_from("<III", data, 4)
+        offset = 16
+        timing_ranks = _decode_ranks(data[offset:offset + timing_size], n_timing)
+        text_ranks = _decode_ranks(data[offset + timing_size:], n_text)
+
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            pass  # evicted by another process meanwhile; the data is still good
+        return timing_ranks, text_ranks
+
+    def put(self, key, timing_ranks, text_ranks):
+        os.makedirs(self.directory, exist_ok=True)
+        timing_data = _encode_ranks(timing_ranks)
+        data = (
+            MAGIC
+            + struct.pack("<III", len(timing_ranks), len(text_ranks), len(timing_data))
+            + timing_data
+            + _encode_ranks(text_ranks)
+        )
+        # a temp name per writer: processes may store the same key at once
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(zlib.compress(data))
+            os.replace(tmp_path, self._path(key))
+        except FileNotFoundError:
+            return  # directory removed meanwhile: the cache is best effort
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        # other processes sharing the directory may remove entries meanwhile
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name.endswith(".ranks"):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+class MemoryRankCache:
+    """
+    In-memory RankCache for a long-running process (see functions/daemon.py):
+    same get / put interface, least-recently-used entries evicted beyond
+    max_entries. hits / misses count lookups.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        ranks = self._entries.get(key)
+        if ranks is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return ranks
+
+    def put(self, key, timing_ranks, text_ranks):
+        self._entries[key] = (timing_ranks, text_ranks)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,245 @@
+import configparser
+from colorama import Fore
+from functions.reconcile_rank_fusion import reconcile_rank_fusion
+from functions.apply_time_shift import apply_time_shift_linear
+from functions.text_store import TextStore
+from functions.srt_stream import load_cues
+from functions.rank_cache import RankCache
+from functions.profiler import Profiler
+
+
+def reconcile_from_config(
+    config,
+    workers=None,
+    profiler=None,
+    incremental=False,
+    text_cues=None,
+    timing_cues=None,
+    output_file=None,
+    rank_cache=None,
+    text_stores=None,
+):
+    """
+    Reconcile the [files] pair of config (a ConfigParser, or the path of an
+    ini file) with its settings → summary.
+    text_cues / timing_cues are already loaded CueTables to use instead of
+    reading the files; text_cues is shifted in place.
+    output_file (a path or an open text stream) replaces [files] output.
+    rank_cache (RankCache / MemoryRankCache) replaces the [cache] one and
+    text_stores (TextStoreCache) provides the TextStores, so that a
+    long-running process keeps both across calls.
+    """
+    if profiler is None:
+        profiler = Profiler()
+
+    # ─────────────── Load config ───────────────
+    if not isinstance(config, configparser.ConfigParser):
+        config_path = config
+        config = configparser.ConfigParser()
+        config.read(config_path)
+
+    # ─────────────── File paths ───────────────
+    text_srt_path = config.get("files", "text_source")
+    timing_srt_path = config.get("files", "timing_source")
+    output_srt_path = output_file if output_file is not None else config.get("files", "output")
+    # other timing releases of the same episode, matched along with timing_source
+    extra_timing_paths = [
+        path.strip() for path in config.get("multi_source", "timing_sources", fallback="").split(",") if path.strip()
+    ]
+    pick = config.get("multi_source", "pick", fallback="best")
+    if extra_timing_paths:
+        from functions.reconcile_multi_source import PICKS
+        # fail before loading and shifting, not after
+        if pick not in PICKS:
+            raise ValueError(f"Unknown pick '{pick}', expected one of: {', '.join(PICKS)}")
+
+    # ─────────────── Matching parameters ───────────────
+    matching_cfg = config["matching"]
+    time_tolerance_start = matching_cfg.getint("time_tolerance_ms_start")
+    time_tolerance_end = matching_cfg.getint("time_tolerance_ms_end")
+    min_similarity = matching_cfg.getfloat("min_similarity")
+    top_k = matching_cfg.getint("top_k")
+    max_avg_rank = matching_cfg.getfloat("max_avg_rank")
+    max_gap = matching_cfg.getint("max_gap")
+    fallback_to_timing_text = matching_cfg.getboolean("fallback_to_timing_text")
+    scorer = matching_cfg.get("scorer", fallback="difflib")
+    candidates = matching_cfg.get("candidates", fallback="window")
+    lsh_num_perm = matching_cfg.getint("lsh_num_perm", fallback=64)
+    lsh_bands = matching_cfg.getint("lsh_bands", fallback=64)
+    lsh_report_recall = matching_cfg.getboolean("lsh_report_recall", fallback=False)
+    scoring = matching_cfg.get("scoring", fallback="pairwise")
+    vector_prefilter_k = matching_cfg.getint("vector_prefilter_k", fallback=24)
+    warp_every = matching_cfg.getint("warp_every", fallback=10)
+    warp_margin_ms = matching_cfg.getint("warp_margin_ms", fallback=2000)
+    warp_scorer = matching_cfg.get("warp_scorer", fallback="indel")
+    anchor_mode = matching_cfg.get("anchor_mode", fallback="greedy")
+    engine = matching_cfg.get("engine", fallback="rank_fusion")
+
+    # ─────────────── Performance ───────────────
+    workers = workers or config.getint("performance", "workers", fallback=1)
+    if rank_cache is None and config.getboolean("cache", "enabled", fallback=False):
+        rank_cache = RankCache(
+            config.get("cache", "directory", fallback="files/cache"),
+            config.getfloat("cache", "max_mb", fallback=200),
+        )
+    state_file = None
+    if incremental or config.getboolean("incremental", "enabled", fallback=False):
+        state_file = config.get("incremental", "state", fallback="files/cache/reconcile.state")
+
+    # ─────────────── Shift ───────────────
+    shift_cfg = config["shift"]
+    shift_start_ms = shift_cfg.getint("shift_start_ms", fallback=0)
+    shift_end_ms = shift_cfg.getint("shift_end_ms", fallback=0)
+    auto_shift = shift_cfg.getboolean("auto", fallback=False)
+    auto_bin_ms = shift_cfg.getint("auto_bin_ms", fallback=100)
+    auto_max_offset_ms = shift_cfg.getint("auto_max_offset_ms", fallback=300000)
+    auto_tolerance = shift_cfg.getboolean("auto_tolerance", fallback=True)
+
+    # ─────────────── Streaming mode (very long files) ───────────────
+    stream = config.getboolean("stream", "enabled", fallback=False)
+    if stream and (text_cues is not None or timing_cues is not None or hasattr(output_srt_path, "write")):
+        print(Fore.YELLOW + "⚠ Streaming mode reads and writes files on disk, reconciling in memory")
+        stream = False
+    if stream:
+        if extra_timing_paths:
+            print(Fore.YELLOW + "⚠ Streaming mode only reads timing_source, [multi_source] is ignored")
+        if (auto_shift or engine != "rank_fusion" or candidates != "window" or scoring != "pairwise"
+                or anchor_mode != "greedy"):
+            print(Fore.YELLOW + "⚠ Streaming mode ignores auto shift and uses engine = rank_fusion, "
+                                "candidates = window, scoring = pairwise, anchor_mode = greedy")
+        from functions.reconcile_stream import reconcile_stream
+        print(Fore.CYAN + "▶ Reconciling subtitles (streaming)...")
+        return reconcile_stream(
+            text_srt_path,
+            timing_srt_path,
+            output_srt_path,
+            time_tolerance_start=time_tolerance_start,
+            time_tolerance_end=time_tolerance_end,
+            min_similarity=min_similarity,
+            top_k=top_k,
+            max_avg_rank=max_avg_rank,
+            scorer=scorer,
+            anchor_mode="greedy",
+            shift_start_ms=shift_start_ms if shift_end_ms != 0 else 0,
+            shift_end_ms=shift_end_ms,
+            window_ms=config.getint("stream", "window_ms", fallback=600000),
+            margin_ms=config.getint("stream", "margin_ms", fallback=30000),
+            profiler=profiler,
+        )
+
+    # ─────────────── Load subtitles ───────────────
+    print(Fore.CYAN + "▶ Loading SRT files...")
+    # streamed straight into compact cue tables
+    with profiler.stage("load"):
+        text_subs = text_cues if text_cues is not None else load_cues(text_srt_path, encoding="utf-8")
+        timing_subs = timing_cues if timing_cues is not None else load_cues(timing_srt_path, encoding="utf-8")
+    print(Fore.GREEN + f"✔ Loaded {len(text_subs)} text subtitles")
+    print(Fore.GREEN + f"✔ Loaded {len(timing_subs)} timing subtitles\n")
+
+    # Normalized text is computed once per file and shared by every stage
+    new_store = text_stores.get if text_stores is not None else TextStore.from_cues
+    text_store = new_store(text_subs)
+    timing_store = new_store(timing_subs)
+
+    # Estimate the shift (and the tolerance still needed) from the files
+    if auto_shift:
+        from functions.estimate_shift import estimate_shift  # numpy, when installed
+        with profiler.stage("auto_shift"):
+            estimate = estimate_shift(
+                text_subs,
+                timing_subs,
+                text_store,
+                timing_store,
+                bin_ms=auto_bin_ms,
+                max_offset_ms=auto_max_offset_ms,
+                scorer=scorer,
+            )
+        if estimate["tolerance_ms"] is None:
+            # too few text anchors to confirm the activity correlation
+            print(Fore.YELLOW + f"⚠ Estimated shift {estimate['shift_start_ms']} → {estimate['shift_end_ms']} ms "
+                                f"not confirmed ({estimate['anchors']} anchors), using [shift] "
+                                f"{shift_start_ms} → {shift_end_ms} ms instead\n")
+            auto_shift = False
+        else:
+            shift_start_ms, shift_end_ms = estimate["shift_start_ms"], estimate["shift_end_ms"]
+            print(Fore.YELLOW + f"⚡ Estimated shift {shift_start_ms} → {shift_end_ms} ms "
+                                f"({estimate['drift_ms_per_hour']:+.0f} ms/h, {estimate['anchors']} anchors)")
+            if auto_tolerance:
+                time_tolerance_start = time_tolerance_end = estimate["tolerance_ms"]
+                print(Fore.YELLOW + f"⚡ Time tolerance narrowed to {estimate['tolerance_ms']} ms\n")
+
+    # Apply global shift if needed
+    if auto_shift or shift_end_ms != 0:
+        with profiler.stage("shift"):
+            apply_time_shift_linear(text_subs, shift_start_ms, shift_end_ms)
+
+    # if time_offset_ms != 0:
+    #     for sub in timing_subs:
+    #         sub.shift(milliseconds=time_offset_ms)
+    #     print(Fore.YELLOW + f"⚡ Applied time offset of {time_offset_ms} ms\n")
+
+    # ─────────────── Reconcile subtitles ───────────────
+    if extra_timing_paths:
+        from functions.reconcile_multi_source import reconcile_multi_source
+        # the shift above is the text file's, estimated on timing_source
+        with profiler.stage("load"):
+            timing_sources = [timing_subs] + [load_cues(path, encoding="utf-8") for path in extra_timing_paths]
+        print(Fore.CYAN + f"▶ Reconciling subtitles against {len(timing_sources)} timing sources...")
+        return reconcile_multi_source(
+            text_source=text_subs,
+            timing_sources=timing_sources,
+            output_file=output_srt_path,
+            names=[timing_srt_path] + extra_timing_paths,
+            time_tolerance_start=time_tolerance_start,
+            time_tolerance_end=time_tolerance_end,
+            min_similarity=min_similarity,
+            top_k=top_k,
+            max_avg_rank=max_avg_rank,
+            text_store=text_store,
+            timing_stores=[timing_store] + [new_store(cues) for cues in timing_sources[1:]],
+            scorer=scorer,
+            workers=workers,
+            candidate_mode=candidates,
+            scoring=scoring,
+            anchor_mode=anchor_mode,
+            engine=engine,
+            pick=pick,
+            segment_cues=config.getint("multi_source", "segment_cues", fallback=100),
+            profiler=profiler,
+            lsh_num_perm=lsh_num_perm,
+            lsh_bands=lsh_bands,
+            vector_prefilter_k=vector_prefilter_k,
+            warp_every=warp_every,
+            warp_margin_ms=warp_margin_ms,
+            warp_scorer=warp_scorer,
+        )
+
+    print(Fore.CYAN + "▶ Reconciling subtitles...")
+    return reconcile_rank_fusion(
+        text_source=text_subs,
+        timing_source=timing_subs,
+        output_file=output_srt_path,
+        time_tolerance_start=time_tolerance_start,
+        time_tolerance_end=time_tolerance_end,
+        min_similarity=min_similarity,
+        top_k=top_k,
+        max_avg_rank=max_avg_rank,
+        text_store=text_store,
+        timing_store=timing_store,
+        scorer=scorer,
+        workers=workers,
+        candidate_mode=candidates,
+        lsh_num_perm=lsh_num_perm,
+        lsh_bands=lsh_bands,
+        lsh_report_recall=lsh_report_recall,
+        scoring=scoring,
+        vector_prefilter_k=vector_prefilter_k,
+        warp_every=warp_every,
+        warp_margin_ms=warp_margin_ms,
+        warp_scorer=warp_scorer,
+        rank_cache=rank_cache,
+        anchor_mode=anchor_mode,
+        engine=engine,
+        state_file=state_file,
+        profiler=profiler,
+    )
@@ -0,0 +1,293 @@
+from colorama import Fore
+from tqdm import tqdm
+from functions.align_banded import align_banded
+from functions.build_mappings_from_rank_matches import build_mappings_from_rank_matches
+from functions.build_ranks import ranks_from_scores
+from functions.build_scores import build_scores
+from functions.build_time_index import build_time_index, query_time_index
+from functions.fill_and_spread import fill_and_spread
+from functions.fuse_ranks import fuse_ranks
+from functions.mapping_table import MappingTable, Origin
+from functions.profiler import Profiler
+from functions.score_pairs import dynamic_tolerance
+from functions.scorers import get_scorer
+from functions.select_anchors import select_anchors
+from functions.srt_stream import write_srt
+from functions.summarize_mappings import summarize_mappings
+from functions.text_store import TextStore
+from functions.worker_pool import worker_pool
+from functions.write_reconciled_srt import annotate, summary_note
+
+PICKS = ("best", "segment")
+
+
+def _score_text_pairs(pairs, min_similarity, scorer):
+    """Similarity of each (text, timing text) pair. Runs in worker processes."""
+    score = get_scorer(scorer)
+    return [score(s_text, t_text, min_similarity) for s_text, t_text in pairs]
+
+
+def shared_window_scores(
+    text_source,
+    timing_sources,
+    time_tolerance_start,
+    time_tolerance_end,
+    min_similarity,
+    text_store,
+    timing_stores,
+    scorer="difflib",
+    workers=1,
+    counters=None,
+):
+    """
+    score_pairs (time window candidates) for one text file against several
+    timing files at once. The text index is built once, the window pairs
+    of every source are collected first, and each distinct (text, timing
+    text) pair is scored once: releases of the same episode mostly carry
+    the same lines, so most pairs are shared between sources.
+    Returns one {(t_idx, s_idx): similarity} dict per source, identical
+    to score_pairs on that source alone.
+    """
+    text_index = build_time_index(text_source)
+    if counters is not None:
+        counters.setdefault("pairs_considered", 0)
+
+    # ── Window pairs of every source, keyed by their normalized texts ──
+    keys = {}
+    pairs = []
+    windows = []
+    n_window = 0
+    for timing_source, timing_store in zip(timing_sources, timing_stores):
+        window = []
+        n_timing = len(timing_source)
+        for t_idx in range(n_timing):
+            tolerance = dynamic_tolerance(t_idx, n_timing, time_tolerance_start, time_tolerance_end)
+            t_text = timing_store.normalized(t_idx)
+            for s_idx in query_time_index(
+                text_index, timing_source.starts[t_idx], timing_source.ends[t_idx], tolerance, counters
+            ):
+                key = (text_store.normalized(s_idx), t_text)
+                key_id = keys.get(key)
+                if key_id is None:
+                    key_id = keys[key] = len(pairs)
+                    pairs.append(key)
+                window.append((t_idx, s_idx, key_id))
+        n_window += len(window)
+        windows.append(window)
+
+    # ── Score each distinct pair once ──
+    if workers <= 1 or len(pairs) < 2:
+        score = get_scorer(scorer)
+        sims = [score(s_text, t_text, min_similarity) for s_text, t_text in tqdm(pairs, desc="Scoring pairs", unit="pair")]
+    else:
+        chunk_size = max(1, -(-len(pairs) // (workers * 4)))
+        chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+        sims = []
+        with worker_pool(workers) as pool:
+            for partial in tqdm(
+                pool.map(_score_text_pairs, chunks, [min_similarity] * len(chunks), [scorer] * len(chunks)),
+                total=len(chunks), desc=f"Scoring pairs ({workers} workers)", unit="chunk",
+            ):
+                sims.extend(partial)
+
+    if counters is not None:
+        counters["pairs_in_window"] = counters.get("pairs_in_window", 0) + n_window
+        counters["similarity_calls"] = counters.get("similarity_calls", 0) + len(pairs)
+    print(Fore.CYAN + f"ℹ Shared scoring  : {len(pairs)} distinct pairs for {n_window} window pairs "
+                      f"over {len(timing_sources)} sources")
+
+    # same iteration order as score_chunk: timing cue, then text cue
+    return [
+        {(t_idx, s_idx): sims[key_id] for t_idx, s_idx, key_id in window if sims[key_id] >= min_similarity}
+        for window in windows
+    ]
+
+
+def match_source(scores, text_source, timing_source, top_k=5, max_avg_rank=3.0, anchor_mode="greedy", engine="rank_fusion"):
+    """Anchors, gap filling and spread for one source's scores → MappingTable"""
+    if engine == "align":
+        rank_matches = align_banded(scores, len(text_source), len(timing_source))
+        origin = Origin.ALIGN
+    else:
+        timing_ranks, text_ranks = ranks_from_scores(scores, len(timing_source), len(text_source), top_k)
+        candidates = fuse_ranks(timing_ranks, text_ranks, max_avg_rank)
+        rank_matches = select_anchors(candidates, anchor_mode)
+        origin = Origin.RANK
+    mappings = build_mappings_from_rank_matches(rank_matches, timing_source, origin)
+    return fill_and_spread(mappings, text_source, timing_source)
+
+
+def source_quality(summary):
+    """Sort key of a match-quality summary: anchors, then gap fills, then fewest spread lines"""
+    return (
+        summary["matched_rank"] + summary["matched_align"],
+        summary["matched_gap"],
+        -summary["matched_spread"] - summary["fallbacks"],
+    )
+
+
+def pick_segments(mappings_list, n_text, segment_cues, fallback):
+    """
+    Best source per block of segment_cues text lines: the one with the most
+    anchors (rank or align rows) in the block, `fallback` on ties.
+    → list of source indexes, one per block
+    """
+    n_blocks = max(-(-n_text // segment_cues), 1)
+    anchors = [[0] * n_blocks for _ in mappings_list]
+    for source, mappings in enumerate(mappings_list):
+        for text_idx, origin in zip(mappings.text_idx, mappings.origin):
+            if origin in (Origin.RANK, Origin.ALIGN):
+                anchors[source][text_idx // segment_cues] += 1
+    return [
+        max(range(len(mappings_list)), key=lambda source: (anchors[source][block], source == fallback))
+        for block in range(n_blocks)
+    ]
+
+
+def reconcile_multi_source(
+    text_source,
+    timing_sources,
+    output_file,
+    names=None,
+    time_tolerance_start=20000,
+    time_tolerance_end=160000,
+    min_similarity=0.55,
+    top_k=5,
+    max_avg_rank=3.0,
+    text_store=None,
+    timing_stores=None,
+    scorer="difflib",
+    workers=1,
+    candidate_mode="window",
+    scoring="pairwise",
+    anchor_mode="greedy",
+    engine="rank_fusion",
+    pick="best",
+    segment_cues=100,
+    profiler=None,
+    **build_options,
+):
+    """
+    Reconcile one text file against several timing releases of the same
+    episode and keep the best one.
+    The text side (normalized text, features, time index) is computed once
+    and shared; with candidate_mode = "window" and scoring = "pairwise"
+    each distinct pair of lines is scored once for all sources (see
+    shared_window_scores), other modes score each source with build_scores
+    (build_options are passed on) on the shared TextStore.
+    pick = "best" writes the source whose match-quality summary is best
+    (the same file a single run on it gives); pick = "segment" takes each
+    block of segment_cues text lines from the source with the most anchors
+    there. Returns the summary of the output, plus "source" (best source
+    name) and "sources" (text lines taken from each source).
+    """
+    if pick not in PICKS:
+        raise ValueError(f"Unknown pick '{pick}', expected one of: {', '.join(PICKS)}")
+    if profiler is None:
+        profiler = Profiler()
+    if names is None:
+        names = [f"source {i + 1}" for i in range(len(timing_sources))]
+    if text_store is None:
+        text_store = TextStore.from_cues(text_source)
+    if timing_stores is None:
+        timing_stores = [TextStore.from_cues(timing_source) for timing_source in timing_sources]
+
+    # ─────────────── 1. Score every source, sharing the text side ───────────────
+    counters = {}
+    with profiler.stage("rank_build"):
+        if candidate_mode == "window" and scoring == "pairwise":
+            scores_list = shared_window_scores(
+                text_source,
+                timing_sources,
+                time_tolerance_start,
+                time_tolerance_end,
+                min_similarity,
+                text_store,
+                timing_stores,
+                scorer=scorer,
+                workers=workers,
+                counters=counters,
+            )
+        else:
+            scores_list = [
+                build_scores(
+                    text_source,
+                    timing_source,
+                    time_tolerance_start,
+                    time_tolerance_end,
+                    min_similarity,
+                    text_store,
+                    timing_store,
+                    scorer=scorer,
+                    workers=workers,
+                    candidate_mode=candidate_mode,
+                    scoring=scoring,
+                    counters=counters,
+                    **build_options,
+                )
+                for timing_source, timing_store in zip(timing_sources, timing_stores)
+            ]
+    profiler.merge_counters(counters)
+
+    # ─────────────── 2. Anchors, gaps and spread per source ───────────────
+    with profiler.stage("anchor_selection"):
+        mappings_list = [
+            match_source(scores, text_source, timing_source, top_k, max_avg_rank, anchor_mode, engine)
+            for scores, timing_source in zip(scores_list, timing_sources)
+        ]
+    summaries = [summarize_mappings(mappings, len(text_source)) for mappings in mappings_list]
+    best = max(range(len(timing_sources)), key=lambda source: source_quality(summaries[source]))
+    for source, summary in enumerate(summaries):
+        print((Fore.GREEN if source == best else Fore.WHITE)
+              + f"{'✔' if source == best else ' '} {names[source]}: rank {summary['matched_rank']}, "
+                f"align {summary['matched_align']}, gap {summary['matched_gap']}, "
+                f"spread {summary['matched_spread']}, fallbacks {summary['fallbacks']}")
+
+    # ─────────────── 3. Pick a source for the whole file or per segment ───────────────
+    if pick == "segment":
+        blocks = pick_segments(mappings_list, len(text_source), segment_cues, best)
+        mappings = MappingTable()
+        row_sources = []
+        for source, table in enumerate(mappings_list):
+            for row in table:
+                if blocks[row[0] // segment_cues] == source:
+                    mappings.append(*row)
+                    row_sources.append(source)
+        # rows of different sources interleave by text line
+        order = sorted(range(len(mappings)), key=lambda row: mappings.text_idx[row])
+    else:
+        mappings = mappings_list[best]
+        row_sources = [best] * len(mappings)
+        order = range(len(mappings))
+
+    # ─────────────── 4. Write output SRT ───────────────
+    summary = summarize_mappings(mappings, len(text_source))
+    with profiler.stage("write"):
+        items = [(0, 0, summary_note(summary))]
+        for row in order:
+            text_idx, time_idx = mappings.text_idx[row], mappings.time_idx[row]
+            timing_source = timing_sources[row_sources[row]]
+            timing_text = timing_source.texts[time_idx] if 0 <= time_idx < len(timing_source) else None
+            items.append((
+                mappings.start[row] * 1000,
+                mappings.end[row] * 1000,
+                annotate(text_source.texts[text_idx], Origin(mappings.origin[row]), timing_text),
+            ))
+        # stable sort on exact times, as write_reconciled_srt
+        items.sort(key=lambda item: (item[0], item[1]))
+        write_srt(output_file, items)
+
+    sources = {name: 0 for name in names}
+    for source in row_sources:
+        sources[names[source]] += 1
+    if pick == "segment":
+        print(Fore.CYAN + "ℹ Lines per source: " + ", ".join(f"{name} {count}" for name, count in sources.items()))
+
+    print(Fore.CYAN + f"▶ Reconciliation complete ({names[best]} is the best source)")
+    print(
+        Fore.GREEN + f"✔ Matched (rank)  : {summary['matched_rank']}\n"
+        + Fore.BLUE + f"✔ Matched (gap)   : {summary['matched_gap']}\n"
+        + Fore.MAGENTA + f"✔ Matched (spread): {summary['matched_spread']}\n"
+        + Fore.RED + f"↩ Fallbacks       : {summary['fallbacks']}"
+    )
+    return {**summary, "source": names[best], "sources": sources}
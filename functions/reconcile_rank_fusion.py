@@ -1,11 +1,19 @@
-import pysrt
 from colorama import Fore
+from functions.build_scores import build_scores
+from functions.incremental_scores import incremental_scores
+from functions.rank_cache import rank_cache_key
+from functions.text_store import TextStore
 from functions.build_ranks import build_ranks
+from functions.fuse_ranks import fuse_ranks
+from functions.select_anchors import select_anchors
+from functions.align_banded import align_banded
+from functions.summarize_mappings import summarize_mappings
+from functions.mapping_table import Origin
+from functions.profiler import Profiler
 from functions.build_mappings_from_rank_matches import build_mappings_from_rank_matches
-from functions.fill_gaps import fill_gaps
-from functions.spread_remaining import spread_remaining
+from functions.fill_and_spread import fill_and_spread
 from functions.write_reconciled_srt import write_reconciled_srt
-from functions.build_final_subs import build_final_subs  # helper to build pysrt from mappings
+from functions.build_final_subs import build_final_subs  # helper to build output items from mappings
 
 
 def reconcile_rank_fusion(
@@ -17,87 +25,198 @@ def reconcile_rank_fusion(
     min_similarity=0.55,
     top_k=5,
     max_avg_rank=3.0,
+    text_store=None,
+    timing_store=None,
+    scorer="difflib",
+    workers=1,
+    candidate_mode="window",
+    lsh_num_perm=64,
+    lsh_bands=64,
+    lsh_report_recall=False,
+    scoring="pairwise",
+    vector_prefilter_k=24,
+    warp_every=10,
+    warp_margin_ms=2000,
+    warp_scorer="indel",
+    rank_cache=None,
+    anchor_mode="greedy",
+    engine="rank_fusion",
+    state_file=None,
+    profiler=None,
 ):
     """
     Reconcile subtitles using:
     1. Rank-fusion (anchors)
     2. Gap-filling between anchors
     3. Spread remaining unmatched text evenly
+    (2 and 3 run as a single sweep over the anchors)
+    text_store / timing_store hold the pre-normalized text of each file,
+    scorer names the similarity backend, workers > 1 scores in a process pool.
+    candidate_mode = "lsh" only scores window pairs sharing a MinHash/LSH
+    bucket; lsh_report_recall compares against brute force.
+    candidate_mode = "warp" is a two-pass mode: warp_scorer finds anchors
+    on every warp_every-th text cue, then pairs are only scored within
+    warp_margin_ms of the piecewise time warp between them.
+    scoring = "vector" scores with n-gram cosine matrix products (numpy),
+    "vector_prefilter" uses them to pick vector_prefilter_k pairs per
+    timing cue for the exact scorer.
+    rank_cache (RankCache) reuses ranks from a previous run with the same
+    inputs and ranking settings.
+    anchor_mode = "monotonic" keeps only order-preserving anchors
+    (weighted LIS) instead of the greedy best-rank-first pass.
+    engine = "align" replaces steps 1–3 by a banded global alignment of
+    text against timing; its anchors are tagged "align".
+    state_file keeps this run's text cues and scores so the next run only
+    re-scores edited text cues (pairwise scoring of the time window only).
+    profiler (Profiler) records time, memory and counters per stage.
     """
+    if profiler is None:
+        profiler = Profiler()
+    if text_store is None:
+        text_store = TextStore.from_cues(text_source)
+    if timing_store is None:
+        timing_store = TextStore.from_cues(timing_source)
 
-    # ─────────────── 1. Build bidirectional ranks ───────────────
-    timing_ranks, text_ranks = build_ranks(
-        text_source,
-        timing_source,
-        time_tolerance_start,
-        time_tolerance_end,
-        min_similarity,
-        top_k,
-    )
+    # ─────────────── 1. Score pairs once (or reuse cached ranks) ───────────────
+    ranks = None
+    if rank_cache is not None and engine == "rank_fusion":
+        # only the settings the selected modes read: changing an unused one
+        # must not invalidate cached ranks
+        params = {
+            "time_tolerance_start": time_tolerance_start,
+            "time_tolerance_end": time_tolerance_end,
+            "min_similarity": min_similarity,
+            "top_k": top_k,
+            "candidates": candidate_mode,
+            "scoring": scoring,
+        }
+        if scoring != "vector":  # pure cosine scoring ignores the scorer
+            params["scorer"] = scorer
+        if scoring == "vector_prefilter":
+            params["vector_prefilter_k"] = vector_prefilter_k
+        if candidate_mode == "lsh":
+            params.update(lsh_num_perm=lsh_num_perm, lsh_bands=lsh_bands)
+        elif candidate_mode == "warp":
+            params.update(warp_every=warp_every, warp_margin_ms=warp_margin_ms, warp_scorer=warp_scorer)
+        cache_key = rank_cache_key(text_source, timing_source, params)
+        ranks = rank_cache.get(cache_key)
+        if ranks is not None:
+            print(Fore.GREEN + "✔ Ranks loaded from cache")
+            profiler.count("rank_cache_hits")
 
-    # ─────────────── 2. Build candidate pairs ───────────────
-    candidates = []
-    for t_idx, s_ranks in timing_ranks.items():
-        for s_idx, r1 in s_ranks.items():
-            if t_idx not in text_ranks.get(s_idx, {}):
-                continue
-            r2 = text_ranks[s_idx][t_idx]
-            avg = (r1 + r2) / 2
-            if avg <= max_avg_rank:
-                candidates.append((avg, s_idx, t_idx))
-    candidates.sort(key=lambda x: x[0])
+    if ranks is None:
+        counters = {}
+        with profiler.stage("rank_build"):
+            if state_file is not None and candidate_mode == "window" and scoring == "pairwise":
+                scores = incremental_scores(
+                    state_file,
+                    text_source,
+                    timing_source,
+                    time_tolerance_start,
+                    time_tolerance_end,
+                    min_similarity,
+                    text_store,
+                    timing_store,
+                    scorer=scorer,
+                    workers=workers,
+                    counters=counters,
+                )
+            else:
+                scores = build_scores(
+                    text_source,
+                    timing_source,
+                    time_tolerance_start,
+                    time_tolerance_end,
+                    min_similarity,
+                    text_store,
+                    timing_store,
+                    scorer=scorer,
+                    workers=workers,
+                    candidate_mode=candidate_mode,
+                    lsh_num_perm=lsh_num_perm,
+                    lsh_bands=lsh_bands,
+                    lsh_report_recall=lsh_report_recall,
+                    scoring=scoring,
+                    vector_prefilter_k=vector_prefilter_k,
+                    warp_every=warp_every,
+                    warp_margin_ms=warp_margin_ms,
+                    warp_scorer=warp_scorer,
+                    counters=counters,
+                )
+        profiler.merge_counters(counters)
 
-    # ─────────────── 3. Greedy monotonic assignment (anchors) ───────────────
-    used_text = set()
-    used_time = set()
-    rank_matches = []
+    if engine == "align":
+        # ─────────────── 2–3. Banded global alignment (anchors) ───────────────
+        with profiler.stage("anchor_selection"):
+            rank_matches = align_banded(scores, len(text_source), len(timing_source))
+        origin = Origin.ALIGN
+    else:
+        # ─────────────── 2. Bidirectional ranks → candidate pairs ───────────────
+        if ranks is None:
+            with profiler.stage("rank_build"):
+                ranks = build_ranks(
+                    text_source,
+                    timing_source,
+                    time_tolerance_start,
+                    time_tolerance_end,
+                    min_similarity,
+                    top_k,
+                    scores=scores,
+                )
+            if rank_cache is not None:
+                rank_cache.put(cache_key, *ranks)
 
-    for _, text_idx, time_idx in candidates:
-        if text_idx in used_text or time_idx in used_time:
-            continue
-        rank_matches.append((text_idx, time_idx))
-        used_text.add(text_idx)
-        used_time.add(time_idx)
+        timing_ranks, text_ranks = ranks
+        with profiler.stage("candidate_fusion"):
+            candidates = fuse_ranks(timing_ranks, text_ranks, max_avg_rank)
+        profiler.count("fused_candidates", len(candidates))
 
-    # ─────────────── 4. Build anchor mapping array ───────────────
-    mappings = build_mappings_from_rank_matches(rank_matches, timing_source)
+        # ─────────────── 3. Anchor assignment (greedy or monotonic) ───────────────
+        with profiler.stage("anchor_selection"):
+            rank_matches = select_anchors(candidates, anchor_mode)
+        origin = Origin.RANK
+    profiler.count("anchors", len(rank_matches))
 
-    # ─────────────── 5. Fill gaps safely ───────────────
-    mappings = fill_gaps(mappings, timing_source)
+    # ─────────────── 4. Build anchor mapping array ───────────────
+    mappings = build_mappings_from_rank_matches(rank_matches, timing_source, origin)
 
-    # ─────────────── 6. Spread remaining unmatched text ───────────────
-    mappings = spread_remaining(mappings, text_source)
+    # ─────────────── 5–6. Fill gaps safely, spread remaining unmatched text ───────────────
+    with profiler.stage("gap_fill_spread"):
+        mappings = fill_and_spread(mappings, text_source, timing_source)
 
-    # ─────────────── 7. Build final pysrt subtitles ───────────────
-    final_subs = build_final_subs(mappings, text_source)
+    # ─────────────── 7. Build final subtitles ───────────────
+    with profiler.stage("final_build"):
+        final_subs = build_final_subs(mappings, text_source)
 
     # ─────────────── 8. Calculate stats ───────────────
-    matched_rank = sum(m["origin"] == "rank" for m in mappings)
-    matched_gap = sum(m["origin"] == "gap" for m in mappings)
-    matched_spread = sum(m["origin"] == "spread" for m in mappings)
-    fallback = len(text_source) - len(mappings)
-
-    summary = {
-        "matched_rank": matched_rank,
-        "matched_gap": matched_gap,
-        "matched_spread": matched_spread,
-        "fallbacks": fallback,
-    }
+    summary = summarize_mappings(mappings, len(text_source))
 
     # ─────────────── 9. Write output SRT ───────────────
-    write_reconciled_srt(
-        output_file,
-        final_subs,
-        summary,
-        mappings,
-        timing_source
-    )
+    with profiler.stage("write"):
+        write_reconciled_srt(
+            output_file,
+            final_subs,
+            summary,
+            mappings,
+            timing_source
+        )
 
     # ─────────────── 10. Console output ───────────────
     print(Fore.CYAN + "▶ Reconciliation complete")
+    if summary["matched_align"]:
+        print(Fore.GREEN + f"✔ Matched (align) : {summary['matched_align']}")
     print(
-        Fore.GREEN + f"✔ Matched (rank)  : {matched_rank}\n"
-        + Fore.BLUE + f"✔ Matched (gap)   : {matched_gap}\n"
-        + Fore.MAGENTA + f"✔ Matched (spread): {matched_spread}\n"
-        + Fore.RED + f"↩ Fallbacks       : {fallback}"
+        Fore.GREEN + f"✔ Matched (rank)  : {summary['matched_rank']}\n"
+        + Fore.BLUE + f"✔ Matched (gap)   : {summary['matched_gap']}\n"
+        + Fore.MAGENTA + f"✔ Matched (spread): {summary['matched_spread']}\n"
+        + Fore.RED + f"↩ Fallbacks       : {summary['fallbacks']}"
     )
+    cache = {name: text_store.stats()[name] + timing_store.stats()[name] for name in ("hits", "misses")}
+    # a single pass normalizes each cue once; hits only come from stores
+    # reused across stages or jobs (auto shift, LSH, daemon)
+    if cache["hits"]:
+        print(Fore.CYAN + f"ℹ Text cache      : {cache['hits']} hits / {cache['misses']} misses")
+    profiler.count("text_cache_hits", cache["hits"])
+    profiler.count("text_cache_misses", cache["misses"])
+
+    return summary
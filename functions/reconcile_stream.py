@@ -0,0 +1,329 @@
+import heapq
+import os
+import shutil
+from bisect import bisect_left, insort
+from array import array
+from colorama import Fore
+from functions.apply_time_shift import linear_shift_ms
+from functions.build_ranks import ranks_from_scores
+from functions.fill_and_spread import fill_segment, spread_segment
+from functions.fuse_ranks import fuse_ranks
+from functions.mapping_table import MappingTable, Origin
+from functions.normalize import normalize
+from functions.profiler import Profiler
+from functions.score_pairs import dynamic_tolerance, score_chunk
+from functions.select_anchors import select_anchors
+from functions.srt_stream import read_srt, write_srt
+from functions.write_reconciled_srt import annotate, summary_note
+
+
+class _Column:
+    """One column of a CueWindow, indexed by cue index in the whole file"""
+
+    __slots__ = ("window", "name")
+
+    def __init__(self, window, name):
+        self.window = window
+        self.name = name
+
+    def __getitem__(self, idx):
+        return getattr(self.window, self.name)[idx - self.window.base]
+
+
+class CueWindow:
+    """
+    The cues of one SRT file currently held in memory: a contiguous run
+    base .. base + len - 1, read on demand from a (start, end, text)
+    iterator and dropped from the front once no longer needed.
+    starts / ends / texts are indexed like a CueTable of the whole file.
+    """
+
+    def __init__(self, cues):
+        self._source = iter(cues)
+        self._next = next(self._source, None)
+        self.base = 0
+        self._starts = array("q")
+        self._ends = array("q")
+        self._texts = []
+        self._norms = []
+        self.starts = _Column(self, "_starts")
+        self.ends = _Column(self, "_ends")
+        self.texts = _Column(self, "_texts")
+        self.normalized = _Column(self, "_norms")
+
+    def __len__(self):
+        return len(self._starts)
+
+    @property
+    def stop(self):
+        """One past the last cue index read so far"""
+        return self.base + len(self._starts)
+
+    @property
+    def exhausted(self):
+        return self._next is None
+
+    @property
+    def next_start(self):
+        """Start of the next cue to read (inf once the file is read)"""
+        return float("inf") if self._next is None else self._next[0]
+
+    def read_until(self, ms):
+        """Read every cue starting before ms"""
+        while self._next is not None and self._next[0] < ms:
+            start, end, text = self._next
+            self._starts.append(start)
+            self._ends.append(end)
+            self._texts.append(text)
+            self._norms.append(normalize(text))
+            self._next = next(self._source, None)
+
+    def first_starting_at(self, ms):
+        """Index of the first cue held that starts at or after ms"""
+        return self.base + bisect_left(self._starts, ms)
+
+    def drop_before(self, idx):
+        count = min(max(idx - self.base, 0), len(self._starts))
+        if count:
+            del self._starts[:count]
+            del self._ends[:count]
+            del self._texts[:count]
+            del self._norms[:count]
+            self.base += count
+
+
+def _scan(path, encoding="utf-8"):
+    """(count, first start, last end) of an SRT file, without keeping it"""
+    count, first_start, last_end = 0, None, None
+    for start, end, _ in read_srt(path, encoding):
+        if first_start is None:
+            first_start = start
+        count += 1
+        last_end = end
+    return count, first_start, last_end
+
+
+def _shifted(path, shift_start_ms, shift_end_ms, first_start, total_duration):
+    """read_srt with apply_time_shift_linear applied on the fly"""
+    for start, end, text in read_srt(path):
+        shift_ms = linear_shift_ms(start, end, first_start, total_duration, shift_start_ms, shift_end_ms)
+        yield int(start + shift_ms), int(end + shift_ms), text
+
+
+def reconcile_stream(
+    text_path,
+    timing_path,
+    output_file,
+    time_tolerance_start=20000,
+    time_tolerance_end=160000,
+    min_similarity=0.55,
+    top_k=5,
+    max_avg_rank=3.0,
+    scorer="difflib",
+    anchor_mode="greedy",
+    shift_start_ms=0,
+    shift_end_ms=0,
+    window_ms=600_000,
+    margin_ms=30_000,
+    profiler=None,
+):
+    """
+    Rank-fusion reconciliation of two SRT files read incrementally, for
+    files too long to hold in memory (both files must be sorted by time).
+
+    The timing clock is cut into cores of window_ms. Each core is scored,
+    ranked, fused and anchored together with its neighbourhood of
+    2 × tolerance + margin_ms on both sides, and keeps the anchors whose
+    timing cue falls inside the core. Gap filling and spreading run as
+    soon as a segment is closed by final anchors on both sides, and
+    output is written in time order as soon as no later row can precede
+    it. Only the cues of the current window (plus any segment still
+    waiting for its closing anchor) are kept in memory.
+
+    Matches the in-memory mode (window candidates, pairwise scoring,
+    rank_fusion engine, greedy anchors) wherever the neighbourhood covers
+    the tolerance. With anchor_mode = monotonic each window keeps its own
+    best increasing chain, which is not always the global one: a few
+    anchors, and the rows around them, may differ from the in-memory run.
+    shift_start_ms / shift_end_ms: linear shift of the text file, as
+    apply_time_shift_linear. Returns the summary dict.
+    """
+    if profiler is None:
+        profiler = Profiler()
+
+    # ─────────────── 0. Cue counts and text span (one cheap pass) ───────────────
+    with profiler.stage("load"):
+        n_text, first_start, last_end = _scan(text_path)
+        n_timing, _, _ = _scan(timing_path)
+    text_cues = read_srt(text_path)
+    if n_text and (shift_start_ms or shift_end_ms):
+        text_cues = _shifted(text_path, shift_start_ms, shift_end_ms, first_start, max(last_end - first_start, 1))
+    text = CueWindow(text_cues)
+    timing = CueWindow(read_srt(timing_path))
+
+    # a cue of the core and all of its possible partners' partners
+    margin = 2 * max(time_tolerance_start, time_tolerance_end) + margin_ms
+
+    counts = {origin: 0 for origin in Origin}
+    pending = []       # anchors (text_idx, time_idx, start, end) not yet closed, in text order
+    anchored_text = set()
+    anchored_time = set()
+    state = {"last": None, "seq": 0}
+    heap = []          # output items (start_ms, end_ms, seq, text), flushed in time order
+
+    def emit(rows):
+        for text_idx, time_idx, start, end, origin in rows:
+            counts[origin] += 1
+            timing_text = timing.texts[time_idx] if time_idx is not None else None
+            item = annotate(text.texts[text_idx], origin, timing_text)
+            heapq.heappush(heap, (start * 1000, end * 1000, state["seq"], item))
+            state["seq"] += 1
+
+    def close_segment(right):
+        """Rows from the last final anchor up to (not including) right"""
+        out = MappingTable()
+        last = state["last"]
+        if last is None:
+            t1 = right[2]
+            spread_segment(out, 0, right[0], max(t1 - 10.0, 0.0), t1, text)
+        else:
+            out.append(last[0], last[1], last[2], last[3], Origin.RANK)
+            dt = right[0] - last[0]
+            ds = right[1] - last[1]
+            if dt > 1 and dt == ds:
+                fill_segment(out, last[0], last[1], dt, timing)
+            elif dt > 1:
+                spread_segment(out, last[0] + 1, right[0], last[3], right[2], text)
+        emit(out)
+        state["last"] = right
+
+    def flush(bound):
+        while heap and heap[0][0] < bound:
+            start, end, _, item = heapq.heappop(heap)
+            yield start, end, item
+
+    def body():
+        core = min(text.next_start, timing.next_start)
+        # scores of the previous window by (t_idx, s_idx): pairs of cues
+        # read before are not scored again
+        window_scores = {}
+        scored_text_stop = scored_timing_stop = 0
+        while core != float("inf"):
+            core_end = core + window_ms
+            with profiler.stage("load"):
+                text.read_until(core_end + margin)
+                timing.read_until(core_end + margin)
+            last_core = text.exhausted and timing.exhausted
+
+            # ── Score, rank, fuse and anchor the window ──
+            text_lo = text.first_starting_at(core - margin)
+            timing_lo = timing.first_starting_at(core - margin)
+            with profiler.stage("rank_build"):
+                text_rows = [
+                    (s_idx - text_lo, text.starts[s_idx], text.ends[s_idx], text.normalized[s_idx])
+                    for s_idx in range(text_lo, text.stop)
+                ]
+                new_text = tuple(range(max(scored_text_stop - text_lo, 0), text.stop - text_lo))
+                timing_rows = [
+                    (
+                        t_idx - timing_lo,
+                        timing.starts[t_idx],
+                        timing.ends[t_idx],
+                        dynamic_tolerance(t_idx, n_timing, time_tolerance_start, time_tolerance_end),
+                        timing.normalized[t_idx],
+                        new_text if t_idx < scored_timing_stop else None,
+                    )
+                    for t_idx in range(timing_lo, timing.stop)
+                ]
+                scores, counters = score_chunk(timing_rows, text_rows, min_similarity, scorer)
+                profiler.merge_counters(counters)
+                scores.update(
+                    ((t_idx - timing_lo, s_idx - text_lo), sim)
+                    for (t_idx, s_idx), sim in window_scores.items()
+                    if t_idx >= timing_lo and s_idx >= text_lo
+                )
+                window_scores = {(t_idx + timing_lo, s_idx + text_lo): sim for (t_idx, s_idx), sim in scores.items()}
+                scored_text_stop, scored_timing_stop = text.stop, timing.stop
+                timing_ranks, text_ranks = ranks_from_scores(scores, len(timing_rows), len(text_rows), top_k)
+            with profiler.stage("candidate_fusion"):
+                # cues anchored by earlier cores are taken, as in one global pass
+                candidates = [
+                    (avg, local_text, local_time)
+                    for avg, local_text, local_time in fuse_ranks(timing_ranks, text_ranks, max_avg_rank)
+                    if local_text + text_lo not in anchored_text and local_time + timing_lo not in anchored_time
+                ]
+            with profiler.stage("anchor_selection"):
+                # monotonic: best chain of this window only, see the docstring
+                matches = select_anchors(candidates, anchor_mode)
+
+            for local_text, local_time in matches:
+                s_idx, t_idx = local_text + text_lo, local_time + timing_lo
+                if timing.starts[t_idx] < core or (timing.starts[t_idx] >= core_end and not last_core):
+                    continue
+                anchored_text.add(s_idx)
+                anchored_time.add(t_idx)
+                insort(pending, (s_idx, t_idx, timing.starts[t_idx] / 1000, timing.ends[t_idx] / 1000))
+
+            # ── Close segments whose anchors can no longer change ──
+            # later cores only anchor text starting after core_end - margin
+            safe_text = n_text if last_core else text.first_starting_at(core_end - margin)
+            with profiler.stage("gap_fill_spread"):
+                while pending and pending[0][0] < safe_text:
+                    close_segment(pending.pop(0))
+
+            # ── Write rows no later row can come before ──
+            last = state["last"]
+            if last_core:
+                break
+            if last is not None:
+                bound = min([last[2] * 1000, core_end] + [anchor[2] * 1000 for anchor in pending])
+                with profiler.stage("write"):
+                    yield from flush(bound)
+
+            # ── Forget cues no longer needed ──
+            keep_from = core_end - margin
+            if last is not None:
+                text.drop_before(min(last[0], text.first_starting_at(keep_from)))
+                lowest_time = min([last[1]] + [anchor[1] for anchor in pending])
+                timing.drop_before(min(lowest_time, timing.first_starting_at(keep_from)))
+            anchored_text.difference_update([s_idx for s_idx in anchored_text if s_idx < text.base])
+            anchored_time.difference_update([t_idx for t_idx in anchored_time if t_idx < timing.base])
+            core = core_end
+
+        # ── After the last anchor ──
+        last = state["last"]
+        if last is not None:
+            out = MappingTable()
+            out.append(last[0], last[1], last[2], last[3], Origin.RANK)
+            spread_segment(out, last[0] + 1, n_text, last[3], last[3] + 10.0, text, clamp=False)
+            emit(out)
+        with profiler.stage("write"):
+            yield from flush(float("inf"))
+
+    # Rows go to a side file first: the summary pseudo-sub (item 1) is
+    # only known at the end
+    body_file = output_file + ".part"
+    write_srt(body_file, body(), start_index=2)
+
+    summary = {
+        "matched_rank": counts[Origin.RANK],
+        "matched_align": 0,
+        "matched_gap": counts[Origin.GAP],
+        "matched_spread": counts[Origin.SPREAD],
+        "fallbacks": n_text - sum(counts.values()),
+    }
+    with profiler.stage("write"):
+        write_srt(output_file, [(0, 0, summary_note(summary))])
+        with open(output_file, "a", encoding="utf-8", newline="\n") as output, \
+                open(body_file, encoding="utf-8", newline="\n") as part:
+            shutil.copyfileobj(part, output)
+        os.remove(body_file)
+
+    print(Fore.CYAN + "▶ Reconciliation complete (streaming)")
+    print(
+        Fore.GREEN + f"✔ Matched (rank)  : {summary['matched_rank']}\n"
+        + Fore.BLUE + f"✔ Matched (gap)   : {summary['matched_gap']}\n"
+        + Fore.MAGENTA + f"✔ Matched (spread): {summary['matched_spread']}\n"
+        + Fore.RED + f"↩ Fallbacks       : {summary['fallbacks']}"
+    )
+    return summary
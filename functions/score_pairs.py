@@ -0,0 +1,150 @@
+from concurrent.futures import as_completed
+from tqdm import tqdm
+from functions.scorers import get_scorer
+from functions.text_store import TextStore
+from functions.build_time_index import build_time_index_ms, query_time_index
+from functions.time_overlap import time_overlap
+from functions.worker_pool import worker_pool
+
+
+def dynamic_tolerances(n_timing, time_tolerance_start, time_tolerance_end):
+    """Tolerance per timing subtitle, increasing linearly with position in video"""
+    return [
+        dynamic_tolerance(t_idx, n_timing, time_tolerance_start, time_tolerance_end)
+        for t_idx in range(n_timing)
+    ]
+
+
+def dynamic_tolerance(t_idx, n_timing, time_tolerance_start, time_tolerance_end):
+    """Tolerance of timing subtitle t_idx out of n_timing"""
+    return int(time_tolerance_start + (t_idx / max(1, n_timing - 1)) * (time_tolerance_end - time_tolerance_start))
+
+
+def score_pairs(
+    text_source,
+    timing_source,
+    time_tolerance_start,
+    time_tolerance_end,
+    min_similarity=0.55,
+    text_store=None,
+    timing_store=None,
+    scorer="difflib",
+    workers=1,
+    candidate_pairs=None,
+    counters=None,
+):
+    """
+    Score every (timing, text) pair inside the tolerance window once.
+    Returns a sparse dict {(t_idx, s_idx): similarity} holding only
+    pairs with similarity >= min_similarity.
+    Text is read pre-normalized from the TextStores (built here if missing)
+    and compared with the named scorer (see functions/scorers.py).
+    With workers > 1 the timing timeline is split into chunks scored in a
+    process pool; the merged result is identical to the serial one.
+    candidate_pairs ({t_idx: set(s_idx)}, e.g. from LSH) restricts scoring
+    to those pairs, still within the time window.
+    Hot-path counts are added to the counters dict when given.
+    """
+    if text_store is None:
+        text_store = TextStore.from_cues(text_source)
+    if timing_store is None:
+        timing_store = TextStore.from_cues(timing_source)
+    tolerances = dynamic_tolerances(len(timing_source), time_tolerance_start, time_tolerance_end)
+
+    # Compact cue arrays: plain ints and strings, cheap to send to workers
+    text_rows = [
+        (s_idx, text_source.starts[s_idx], text_source.ends[s_idx], text_store.normalized(s_idx))
+        for s_idx in range(len(text_source))
+    ]
+    timing_rows = [
+        (
+            t_idx,
+            timing_source.starts[t_idx],
+            timing_source.ends[t_idx],
+            tolerances[t_idx],
+            timing_store.normalized(t_idx),
+            None if candidate_pairs is None else tuple(sorted(candidate_pairs.get(t_idx, ()))),
+        )
+        for t_idx in range(len(timing_source))
+    ]
+
+    if workers <= 1 or len(timing_rows) < 2:
+        scores, chunk_counters = score_chunk(timing_rows, text_rows, min_similarity, scorer, progress=True)
+        _add_counters(counters, chunk_counters)
+        return scores
+
+    chunk_size = max(1, -(-len(timing_rows) // (workers * 4)))
+    chunks = [timing_rows[i:i + chunk_size] for i in range(0, len(timing_rows), chunk_size)]
+    results = [None] * len(chunks)
+
+    with worker_pool(workers) as pool:
+        futures = {
+            pool.submit(score_chunk, chunk, _text_rows_near(chunk, text_rows), min_similarity, scorer): i
+            for i, chunk in enumerate(chunks)
+        }
+        with tqdm(total=len(timing_rows), desc=f"Scoring pairs ({workers} workers)", unit="sub") as bar:
+            for future in as_completed(futures):
+                i = futures[future]
+                results[i] = future.result()
+                bar.update(len(chunks[i]))
+
+    # merge in timeline order → same dict as the serial pass
+    scores = {}
+    for partial, chunk_counters in results:
+        scores.update(partial)
+        _add_counters(counters, chunk_counters)
+    return scores
+
+
+def _add_counters(counters, chunk_counters):
+    if counters is not None:
+        for name, n in chunk_counters.items():
+            counters[name] = counters.get(name, 0) + n
+
+
+def _text_rows_near(chunk, text_rows):
+    """Text rows that can fall inside the tolerance window of any cue of chunk"""
+    window_start = min(row[1] - row[3] for row in chunk)
+    window_end = max(row[2] + row[3] for row in chunk)
+    return [row for row in text_rows if row[2] >= window_start and row[1] <= window_end]
+
+
+def score_chunk(timing_rows, text_rows, min_similarity, scorer, progress=False):
+    """
+    Score timing_rows (t_idx, start, end, tolerance, text, allowed) against
+    text_rows (s_idx, start, end, text). allowed is None (whole window)
+    or the sorted text indexes worth scoring. Runs in worker processes.
+    Returns (scores, counters).
+    """
+    score = get_scorer(scorer)
+    text_index = build_time_index_ms([row[1] for row in text_rows], [row[2] for row in text_rows])
+    positions = {row[0]: local_idx for local_idx, row in enumerate(text_rows)}
+    scores = {}
+    counters = {
+        "pairs_considered": 0,
+        "pairs_in_window": 0,
+        "similarity_calls": 0,
+        "pairs_above_threshold": 0,
+    }
+
+    rows = tqdm(timing_rows, desc="Scoring pairs", unit="sub") if progress else timing_rows
+    for t_idx, start, end, tolerance, t_text, allowed in rows:
+        if allowed is None:
+            local_ids = query_time_index(text_index, start, end, tolerance, counters)
+        else:
+            counters["pairs_considered"] += len(allowed)
+            local_ids = [
+                positions[s_idx] for s_idx in allowed
+                if s_idx in positions
+                and time_overlap(start, end, *text_rows[positions[s_idx]][1:3], tolerance)
+            ]
+        counters["pairs_in_window"] += len(local_ids)
+        for local_idx in local_ids:
+            s_idx, _, _, s_text = text_rows[local_idx]
+            sim = score(s_text, t_text, min_similarity)
+            counters["similarity_calls"] += 1
+            if sim >= min_similarity:
+                scores[(t_idx, s_idx)] = sim
+                counters["pairs_above_threshold"] += 1
+
+    return scores, counters
@@ -0,0 +1,93 @@
+import difflib
+from collections import Counter
+
+# rapidfuzz.fuzz, optional backend imported by get_scorer on first use
+fuzz = None
+
+
+# Every scorer takes two normalized strings and a score_cutoff, and returns
+# a ratio in [0.0, 1.0]. Pairs that provably score below the cutoff are
+# rejected early and return 0.0, so results above the cutoff are exact.
+
+
+def _length_bound(a, b):
+    """Upper bound of any 2*matches/total ratio (same as real_quick_ratio)"""
+    total = len(a) + len(b)
+    return 2.0 * min(len(a), len(b)) / total if total else 1.0
+
+
+def _char_bound(a, b):
+    """Upper bound from shared characters (same as quick_ratio)"""
+    total = len(a) + len(b)
+    return 2.0 * sum((Counter(a) & Counter(b)).values()) / total if total else 1.0
+
+
+def difflib_scorer(a, b, score_cutoff=0.0):
+    """difflib.SequenceMatcher ratio, the reference scorer"""
+    matcher = difflib.SequenceMatcher(None, a, b)
+    if score_cutoff > 0 and (
+        matcher.real_quick_ratio() < score_cutoff
+        or matcher.quick_ratio() < score_cutoff
+    ):
+        return 0.0
+    return matcher.ratio()
+
+
+def lcs_length(a, b):
+    """Longest common subsequence length, bit-parallel (one big int per row)"""
+    if not a or not b:
+        return 0
+    masks = {}
+    for i, char in enumerate(a):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    row = full
+    for char in b:
+        matches = row & masks.get(char, 0)
+        row = ((row + matches) | (row - matches)) & full
+    return len(a) - bin(row).count("1")
+
+
+def indel_scorer(a, b, score_cutoff=0.0):
+    """Indel ratio 2*LCS/(len(a)+len(b)), pure Python"""
+    total = len(a) + len(b)
+    if not total:
+        return 1.0
+    if score_cutoff > 0 and (
+        _length_bound(a, b) < score_cutoff
+        or _char_bound(a, b) < score_cutoff
+    ):
+        return 0.0
+    return 2.0 * lcs_length(a, b) / total
+
+
+def rapidfuzz_scorer(a, b, score_cutoff=0.0):
+    """Indel ratio computed by rapidfuzz (C++), when installed"""
+    if score_cutoff > 0 and _length_bound(a, b) < score_cutoff:
+        return 0.0
+    return fuzz.ratio(a, b, score_cutoff=score_cutoff * 100) / 100
+
+
+SCORERS = {
+    "difflib": difflib_scorer,
+    "indel": indel_scorer,
+    "rapidfuzz": rapidfuzz_scorer,
+}
+
+
+def get_scorer(name="difflib"):
+    """Return the scorer function registered under name"""
+    if name not in SCORERS:
+        raise ValueError(f"Unknown scorer '{name}', expected one of: {', '.join(SCORERS)}")
+    if name == "rapidfuzz" and fuzz is None:
+        _import_rapidfuzz()
+    return SCORERS[name]
+
+
+def _import_rapidfuzz():
+    global fuzz
+    try:
+        from rapidfuzz import fuzz as module
+    except ImportError:
+        raise ImportError("Scorer 'rapidfuzz' needs the rapidfuzz package (pip install rapidfuzz)") from None
+    fuzz = module
@@ -0,0 +1,80 @@
+def select_anchors_greedy(candidates):
+    """
+    Walk candidates (avg_rank, text_idx, time_idx) from best to worst and
+    keep each one whose text and timing indexes are both still free.
+    Returns rank_matches [(text_idx, time_idx)].
+    """
+    used_text = set()
+    used_time = set()
+    rank_matches = []
+
+    for _, text_idx, time_idx in candidates:
+        if text_idx in used_text or time_idx in used_time:
+            continue
+        rank_matches.append((text_idx, time_idx))
+        used_text.add(text_idx)
+        used_time.add(time_idx)
+
+    return rank_matches
+
+
+def select_anchors_monotonic(candidates):
+    """
+    Best strictly order-preserving subset of candidates: text and timing
+    indexes both increase, total weight 1 / avg_rank is maximal.
+    Weighted longest increasing subsequence with a Fenwick tree of
+    prefix maxima over timing indexes, O(k log k).
+    Returns rank_matches [(text_idx, time_idx)] in text order.
+    """
+    if not candidates:
+        return []
+
+    size = max(time_idx for _, _, time_idx in candidates) + 2
+    tree = [(0.0, -1)] * (size + 1)  # (best chain weight, candidate id)
+
+    def query(pos):
+        """best chain ending at a timing index < pos"""
+        best = (0.0, -1)
+        while pos > 0:
+            if tree[pos][0] > best[0]:
+                best = tree[pos]
+            pos -= pos & -pos
+        return best
+
+    def update(pos, value):
+        while pos <= size:
+            if value[0] > tree[pos][0]:
+                tree[pos] = value
+            pos += pos & -pos
+
+    # same text index: larger timing first, so they can never chain together
+    order = sorted(range(len(candidates)), key=lambda i: (candidates[i][1], -candidates[i][2]))
+    parent = [-1] * len(candidates)
+    best_end = (0.0, -1)
+
+    for i in order:
+        avg, _, time_idx = candidates[i]
+        prev_weight, prev_id = query(time_idx + 1)
+        weight = prev_weight + 1.0 / avg
+        parent[i] = prev_id
+        update(time_idx + 2, (weight, i))
+        if weight > best_end[0]:
+            best_end = (weight, i)
+
+    rank_matches = []
+    i = best_end[1]
+    while i != -1:
+        _, text_idx, time_idx = candidates[i]
+        rank_matches.append((text_idx, time_idx))
+        i = parent[i]
+
+    return rank_matches[::-1]
+
+
+def select_anchors(candidates, mode="greedy"):
+    """Anchor selection by name: greedy | monotonic"""
+    if mode == "greedy":
+        return select_anchors_greedy(candidates)
+    if mode == "monotonic":
+        return select_anchors_monotonic(candidates)
+    raise ValueError(f"Unknown anchor mode '{mode}', expected greedy or monotonic")
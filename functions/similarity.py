@@ -3,4 +3,8 @@ from functions.normalize import normalize
 
 def similarity(a, b):
     """Return similarity ratio [0.0, 1.0]"""
-    return difflib.SequenceMatcher(None, normalize(a), normalize(b)).ratio()
+    return similarity_normalized(normalize(a), normalize(b))
+
+def similarity_normalized(a, b):
+    """Same as similarity, for text already passed through normalize"""
+    return difflib.SequenceMatcher(None, a, b).ratio()
@@ -0,0 +1,131 @@
+import re
+from functions.cue_table import CueTable
+
+TIMESTAMP_SEPARATOR = "-->"
+RE_TIME_SEP = re.compile(r"[:.,]")
+RE_INTEGER = re.compile(r"^\s*(\d+)")
+# well-formed timing line, checked before the tolerant path
+RE_TIMESTAMPS = re.compile(
+    r"^\s*(\d+):(\d+):(\d+)[,.](\d+)\s*-->\s*(\d+):(\d+):(\d+)[,.](\d+)(?:\s|$)"
+)
+
+
+def parse_time(value):
+    """
+    "HH:MM:SS,mmm" → milliseconds. Tolerates '.' separators, missing hours
+    and OCR junk after the digits. Returns None if unreadable.
+    """
+    parts = RE_TIME_SEP.split(value.strip())
+    if len(parts) == 3:  # MM:SS,mmm
+        parts.insert(0, "0")
+    if len(parts) != 4:
+        return None
+    numbers = []
+    for part in parts:
+        match = RE_INTEGER.match(part)
+        numbers.append(int(match.group(1)) if match else 0)
+    hours, minutes, seconds, millis = numbers
+    return hours * 3600_000 + minutes * 60_000 + seconds * 1000 + millis
+
+
+def parse_timestamps(line):
+    """Timing line → (start_ms, end_ms), or None if it is not one"""
+    if TIMESTAMP_SEPARATOR not in line:
+        return None
+    match = RE_TIMESTAMPS.match(line)
+    if match:
+        h1, m1, s1, ms1, h2, m2, s2, ms2 = map(int, match.groups())
+        return (
+            h1 * 3600_000 + m1 * 60_000 + s1 * 1000 + ms1,
+            h2 * 3600_000 + m2 * 60_000 + s2 * 1000 + ms2,
+        )
+    start, _, rest = line.partition(TIMESTAMP_SEPARATOR)
+    rest = rest.strip().split(" ", 1)[0]  # drop position info
+    start_ms, end_ms = parse_time(start), parse_time(rest)
+    if start_ms is None or end_ms is None:
+        return None
+    return start_ms, end_ms
+
+
+def read_srt(path, encoding="utf-8"):
+    """
+    Generator of (start_ms, end_ms, text), one cue at a time.
+    Tolerant of malformed input: BOM, CRLF, missing index lines, missing
+    blank line between cues, blocks without timing (skipped).
+    path may also be an open text stream (e.g. sys.stdin).
+    """
+    if hasattr(path, "read"):
+        yield from parse_srt_lines(path)
+        return
+    with open(path, encoding=encoding, newline=None) as source:
+        yield from parse_srt_lines(source)
+
+
+def parse_srt_lines(lines):
+    """Same as read_srt, for any iterable of lines"""
+    block = []
+    for line in lines:
+        line = line.rstrip().lstrip("\ufeff")
+        if line.strip():
+            block.append(line)
+            continue
+        yield from _parse_block(block)
+        block = []
+    yield from _parse_block(block)
+
+
+def _parse_block(block):
+    cue = None
+    for line in block:
+        timestamps = parse_timestamps(line)
+        if timestamps is None:
+            if cue is not None:
+                cue[2].append(line)
+            continue
+        if cue is not None:
+            # missing blank line: the previous cue's last line was our index
+            if cue[2] and cue[2][-1].strip().isdigit():
+                cue[2].pop()
+            yield cue[0], cue[1], "\n".join(cue[2])
+        cue = (timestamps[0], timestamps[1], [])
+    if cue is not None:
+        yield cue[0], cue[1], "\n".join(cue[2])
+
+
+def load_cues(path, encoding="utf-8"):
+    """Parse an SRT file straight into a CueTable"""
+    cues = CueTable()
+    for start, end, text in read_srt(path, encoding):
+        cues.starts.append(start)
+        cues.ends.append(end)
+        cues.texts.append(text)
+    return cues
+
+
+def format_time(ms):
+    """Milliseconds (int or float) → "HH:MM:SS,mmm", negative times as zero"""
+    ms = int(ms // 1) if ms > 0 else 0
+    hours, ms = divmod(ms, 3600_000)
+    minutes, ms = divmod(ms, 60_000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
+
+
+def write_srt(path, cues, encoding="utf-8", start_index=1):
+    """
+    Write (start_ms, end_ms, text) items in one pass, numbering them on
+    the fly. path may also be an open text stream (e.g. sys.stdout).
+    Returns the number of cues written.
+    """
+    if hasattr(path, "write"):
+        return _write_items(path, cues, start_index)
+    with open(path, "w", encoding=encoding, newline="\n") as output:
+        return _write_items(output, cues, start_index)
+
+
+def _write_items(output, cues, start_index):
+    count = 0
+    for count, (start, end, text) in enumerate(cues, start=1):
+        item = f"{count + start_index - 1}\n{format_time(start)} --> {format_time(end)}\n{text}\n"
+        output.write(item if item.endswith("\n\n") else item + "\n")
+    return count
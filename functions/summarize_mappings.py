@@ -0,0 +1,11 @@
+from functions.mapping_table import Origin
+
+def summarize_mappings(mappings, n_text):
+    """Count mappings per origin, plus text lines left unmapped"""
+    return {
+        "matched_rank": mappings.count(Origin.RANK),
+        "matched_align": mappings.count(Origin.ALIGN),
+        "matched_gap": mappings.count(Origin.GAP),
+        "matched_spread": mappings.count(Origin.SPREAD),
+        "fallbacks": n_text - len(mappings),
+    }
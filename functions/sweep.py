@@ -0,0 +1,106 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from tqdm import tqdm
+from functions.score_pairs import score_pairs, dynamic_tolerances
+from functions.time_overlap import time_overlap
+from functions.build_ranks import ranks_from_scores
+from functions.fuse_ranks import fuse_ranks
+from functions.select_anchors import select_anchors
+from functions.build_mappings_from_rank_matches import build_mappings_from_rank_matches
+from functions.fill_and_spread import fill_and_spread
+from functions.summarize_mappings import summarize_mappings
+
+SWEEP_KEYS = ("time_tolerance_start", "time_tolerance_end", "min_similarity", "top_k", "max_avg_rank")
+
+# scores and cue tables shared by every grid point of a worker
+_shared = {}
+
+
+def sweep_grid(values):
+    """{key: [values]} → list of parameter dicts, one per grid point"""
+    keys = [key for key in SWEEP_KEYS if key in values]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(values[key] for key in keys))]
+
+
+def filter_scores(scores, text_source, timing_source, time_tolerance_start, time_tolerance_end, min_similarity):
+    """Pairs of a looser score dict that a run with these settings would have kept"""
+    tolerances = dynamic_tolerances(len(timing_source), time_tolerance_start, time_tolerance_end)
+    return {
+        (t_idx, s_idx): sim
+        for (t_idx, s_idx), sim in scores.items()
+        if sim >= min_similarity
+        and time_overlap(
+            timing_source.starts[t_idx], timing_source.ends[t_idx],
+            text_source.starts[s_idx], text_source.ends[s_idx],
+            tolerances[t_idx],
+        )
+    }
+
+
+def _init_shared(scores, text_source, timing_source, anchor_mode):
+    _shared["scores"] = scores
+    _shared["anchor_mode"] = anchor_mode
+    _shared["text_source"] = text_source
+    _shared["timing_source"] = timing_source
+
+
+def evaluate_point(params):
+    """Rank fusion, anchors, gaps and spread for one grid point → (params, summary)"""
+    text_source = _shared["text_source"]
+    timing_source = _shared["timing_source"]
+
+    scores = filter_scores(
+        _shared["scores"],
+        text_source,
+        timing_source,
+        params["time_tolerance_start"],
+        params["time_tolerance_end"],
+        params["min_similarity"],
+    )
+    timing_ranks, text_ranks = ranks_from_scores(scores, len(timing_source), len(text_source), params["top_k"])
+    candidates = fuse_ranks(timing_ranks, text_ranks, params["max_avg_rank"])
+    rank_matches = select_anchors(candidates, _shared["anchor_mode"])
+
+    mappings = build_mappings_from_rank_matches(rank_matches, timing_source)
+    mappings = fill_and_spread(mappings, text_source, timing_source)
+
+    return params, summarize_mappings(mappings, len(text_source))
+
+
+def run_sweep(
+    text_source,
+    timing_source,
+    grid,
+    text_store,
+    timing_store,
+    scorer="difflib",
+    workers=1,
+    anchor_mode="greedy",
+):
+    """
+    Score all pairs once at the loosest setting of the grid, then evaluate
+    every grid point from that shared score dict (in parallel with
+    workers > 1). Returns [(params, summary)] in grid order.
+    """
+    scores = score_pairs(
+        text_source,
+        timing_source,
+        max(p["time_tolerance_start"] for p in grid),
+        max(p["time_tolerance_end"] for p in grid),
+        min(p["min_similarity"] for p in grid),
+        text_store=text_store,
+        timing_store=timing_store,
+        scorer=scorer,
+        workers=workers,
+    )
+
+    if workers <= 1:
+        _init_shared(scores, text_source, timing_source, anchor_mode)
+        return [evaluate_point(params) for params in tqdm(grid, desc="Sweeping", unit="point")]
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_shared,
+        initargs=(scores, text_source, timing_source, anchor_mode),
+    ) as pool:
+        return list(tqdm(pool.map(evaluate_point, grid), total=len(grid), desc="Sweeping", unit="point"))
@@ -0,0 +1,88 @@
+import hashlib
+from collections import OrderedDict
+from functions.normalize import normalize
+
+
+class TextStore:
+    """
+    Normalized text of one SRT file and the features derived from it
+    (character n-grams).
+    Each feature is computed once per cue, on first use, then reused
+    by every scorer and stage. hits / misses count cache lookups.
+    """
+
+    def __init__(self, texts):
+        self.texts = list(texts)
+        self._normalized = [None] * len(self.texts)
+        self._ngrams = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_cues(cls, cues):
+        return cls(cues.texts)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def normalized(self, idx):
+        value = self._normalized[idx]
+        if value is None:
+            self.misses += 1
+            value = self._normalized[idx] = normalize(self.texts[idx])
+        else:
+            self.hits += 1
+        return value
+
+    def ngrams(self, idx, n=3):
+        """Set of character n-grams of the normalized text"""
+        key = (idx, n)
+        value = self._ngrams.get(key)
+        if value is None:
+            self.misses += 1
+            text = self.normalized(idx)
+            value = self._ngrams[key] = (
+                {text[i:i + n] for i in range(len(text) - n + 1)} if len(text) >= n else {text}
+            )
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class TextStoreCache:
+    """
+    TextStores of recently seen files, by text content, for a long-running
+    process (see functions/daemon.py): a job on a file already seen reuses
+    its normalized text and features. Least-recently-used stores are
+    evicted beyond max_entries.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._stores = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, cues):
+        """TextStore of a CueTable's texts (times do not matter)"""
+        digest = hashlib.sha256()
+        for text in cues.texts:
+            digest.update(text.encode("utf-8"))
+            digest.update(b"\0")
+        key = digest.hexdigest()
+        store = self._stores.get(key)
+        if store is None:
+            self.misses += 1
+            store = self._stores[key] = TextStore.from_cues(cues)
+        else:
+            self.hits += 1
+        self._stores.move_to_end(key)
+        while len(self._stores) > self.max_entries:
+            self._stores.popitem(last=False)
+        return store
+
+    def stats(self):
+        return {"entries": len(self._stores), "hits": self.hits, "misses": self.misses}
@@ -1,11 +1,5 @@
-from functions.to_ms import to_ms
-
-def time_overlap(sub_a, sub_b, tolerance_ms):
-    a_start = to_ms(sub_a.start)
-    a_end   = to_ms(sub_a.end)
-    b_start = to_ms(sub_b.start)
-    b_end   = to_ms(sub_b.end)
-
+def time_overlap(a_start, a_end, b_start, b_end, tolerance_ms):
+    """True if [b_start, b_end] reaches [a_start, a_end] widened by tolerance_ms"""
     return (
         b_end   >= a_start - tolerance_ms
         and
@@ -0,0 +1,84 @@
+from bisect import bisect_right
+from tqdm import tqdm
+from functions.build_time_index import build_time_index, query_time_index
+from functions.score_pairs import dynamic_tolerance
+from functions.scorers import get_scorer
+from functions.select_anchors import select_anchors_monotonic
+from functions.time_overlap import time_overlap
+
+
+def warp_anchors(
+    text_source,
+    timing_source,
+    text_store,
+    timing_store,
+    time_tolerance_start,
+    time_tolerance_end,
+    every=10,
+    min_similarity=0.8,
+    scorer="indel",
+):
+    """
+    First pass: every `every`-th text cue is compared with the timing cues
+    of its full tolerance window using a cheap scorer. A cue is kept when
+    one timing cue clearly beats the others, then the kept pairs are
+    reduced to an order-preserving set.
+    Returns [(text_idx, time_idx)] in text order.
+    """
+    score = get_scorer(scorer)
+    index = build_time_index(timing_source)
+    n_timing = len(timing_source)
+    # widest tolerance finds every timing cue that may be in window;
+    # each one then gets its own tolerance, as in the full pass (score_pairs)
+    widest = max(time_tolerance_start, time_tolerance_end)
+
+    candidates = []
+    for s_idx in tqdm(range(0, len(text_source), every), desc="Warp anchors", unit="sub"):
+        start, end = text_source.starts[s_idx], text_source.ends[s_idx]
+        text = text_store.normalized(s_idx)
+        ranked = sorted(
+            (score(text, timing_store.normalized(t_idx)), t_idx)
+            for t_idx in query_time_index(index, start, end, widest)
+            if time_overlap(
+                timing_source.starts[t_idx],
+                timing_source.ends[t_idx],
+                start,
+                end,
+                dynamic_tolerance(t_idx, n_timing, time_tolerance_start, time_tolerance_end),
+            )
+        )
+        if not ranked or ranked[-1][0] < min_similarity:
+            continue
+        if len(ranked) > 1 and ranked[-2][0] > ranked[-1][0] - 0.1:
+            continue
+        sim, t_idx = ranked[-1]
+        # monotonic selection weighs candidates by 1 / avg → weight = similarity
+        candidates.append((1.0 / sim, s_idx, t_idx))
+
+    return select_anchors_monotonic(candidates)
+
+
+def warp_candidates(text_source, timing_source, anchors, margin_ms=2000):
+    """
+    Second-pass candidate pairs from a piecewise-linear time warp.
+    Each text cue between two anchors may have any offset between the
+    anchors' offsets (timing start − text start), so it is only paired
+    with timing cues inside [start + lower offset, end + upper offset]
+    widened by margin_ms. Cues before the first / after the last anchor
+    use that anchor's offset.
+    Returns {t_idx: set(s_idx)}, as lsh_candidates does.
+    """
+    anchor_text = [s_idx for s_idx, _ in anchors]
+    offsets = [timing_source.starts[t_idx] - text_source.starts[s_idx] for s_idx, t_idx in anchors]
+    index = build_time_index(timing_source)
+
+    candidates = {}
+    for s_idx in range(len(text_source)):
+        pos = bisect_right(anchor_text, s_idx)
+        left = max(pos - 1, 0)
+        right = left if anchor_text[left] == s_idx else min(pos, len(anchors) - 1)
+        low, high = sorted((offsets[left], offsets[right]))
+        start, end = text_source.starts[s_idx], text_source.ends[s_idx]
+        for t_idx in query_time_index(index, start + low, end + high, margin_ms):
+            candidates.setdefault(t_idx, set()).add(s_idx)
+    return candidates
@@ -0,0 +1,139 @@
+import zlib
+from tqdm import tqdm
+from functions.scorers import get_scorer
+from functions.score_pairs import dynamic_tolerances
+from functions.build_time_index import build_time_index, query_time_index
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+
+def ngram_vectors(store, indexes, dims=4096, sizes=(2, 3), columns=None):
+    """
+    Encode the normalized text of the cues in indexes as hashed character
+    bi/trigram count vectors, one row each, L2-normalized in place so a
+    dot product is the cosine similarity. columns caches the hashed
+    n-grams of each cue across calls.
+    """
+    if columns is None:
+        columns = {}
+    rows = []
+    cols = []
+    for row, idx in enumerate(indexes):
+        hashed = columns.get(idx)
+        if hashed is None:
+            hashed = columns[idx] = [
+                zlib.crc32(gram.encode("utf-8")) % dims for size in sizes for gram in store.ngrams(idx, size)
+            ]
+        rows.extend([row] * len(hashed))
+        cols.extend(hashed)
+    vectors = np.zeros((len(indexes), dims), dtype=np.float32)
+    np.add.at(vectors, (rows, cols), 1.0)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors /= norms
+    return vectors
+
+
+def vector_score_pairs(
+    text_source,
+    timing_source,
+    time_tolerance_start,
+    time_tolerance_end,
+    min_similarity,
+    text_store,
+    timing_store,
+    prefilter_k=None,
+    scorer="difflib",
+    block_size=256,
+    candidate_pairs=None,
+    counters=None,
+):
+    """
+    Batch alternative to score_pairs: cosine similarity of n-gram vectors
+    for every pair inside the time band, one matrix product per block of
+    timing cues. Returns the same sparse {(t_idx, s_idx): score} dict.
+    With prefilter_k, cosine only selects the prefilter_k best text cues
+    of each timing cue and the exact scorer gives their final score.
+    Vectors are only built for the cues of the current block and its time
+    band, so memory follows block_size, not the file length.
+    candidate_pairs ({t_idx: set(s_idx)}, e.g. from LSH) restricts scoring
+    to those pairs, still within the time window, as in score_pairs.
+    Hot-path counts are added to the counters dict when given.
+    """
+    if np is None:
+        raise ImportError("Vector scoring needs numpy (pip install numpy)")
+
+    tolerances = np.array(
+        dynamic_tolerances(len(timing_source), time_tolerance_start, time_tolerance_end), dtype=np.int64
+    )
+    t_starts = np.array(timing_source.starts, dtype=np.int64)
+    t_ends = np.array(timing_source.ends, dtype=np.int64)
+    s_starts = np.array(text_source.starts, dtype=np.int64)
+    s_ends = np.array(text_source.ends, dtype=np.int64)
+
+    text_columns = {}
+    text_index = build_time_index(text_source)
+    score = get_scorer(scorer)
+    scores = {}
+    if counters is None:
+        counters = {}
+    for name in ("pairs_considered", "pairs_in_window", "similarity_calls", "pairs_above_threshold"):
+        counters.setdefault(name, 0)
+
+    for lo in tqdm(range(0, len(timing_source), block_size), desc="Scoring pairs (vector)", unit="block"):
+        hi = min(lo + block_size, len(timing_source))
+        tol = tolerances[lo:hi]
+
+        # text cues reachable from any cue of the block
+        band = np.array(query_time_index(
+            text_index,
+            int(t_starts[lo:hi].min()),
+            int(t_ends[lo:hi].max()),
+            int(tol.max()),
+        ), dtype=np.int64)
+        if not len(band):
+            continue
+
+        timing_vectors = ngram_vectors(timing_store, range(lo, hi))
+        text_vectors = ngram_vectors(text_store, band.tolist(), columns=text_columns)
+        sims = timing_vectors @ text_vectors.T
+        in_window = (
+            (s_ends[band][None, :] >= (t_starts[lo:hi] - tol)[:, None])
+            & (s_starts[band][None, :] <= (t_ends[lo:hi] + tol)[:, None])
+        )
+        if candidate_pairs is not None:
+            positions = {s_idx: col for col, s_idx in enumerate(band.tolist())}
+            allowed = np.zeros_like(in_window)
+            for row in range(hi - lo):
+                cols = [positions[s_idx] for s_idx in candidate_pairs.get(lo + row, ()) if s_idx in positions]
+                allowed[row, cols] = True
+            in_window &= allowed
+        sims[~in_window] = -1.0
+        counters["pairs_considered"] += sims.size
+        counters["pairs_in_window"] += int(in_window.sum())
+
+        if prefilter_k is None:
+            rows, cols = np.nonzero(sims >= min_similarity)
+            counters["pairs_above_threshold"] += len(rows)
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                scores[(lo + row, int(band[col]))] = float(sims[row, col])
+            continue
+
+        k = min(prefilter_k, len(band))
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        for row in range(hi - lo):
+            t_idx = lo + row
+            for col in sorted(top[row].tolist()):
+                if sims[row, col] < 0:
+                    continue
+                s_idx = int(band[col])
+                sim = score(text_store.normalized(s_idx), timing_store.normalized(t_idx), min_similarity)
+                counters["similarity_calls"] += 1
+                if sim >= min_similarity:
+                    scores[(t_idx, s_idx)] = sim
+                    counters["pairs_above_threshold"] += 1
+
+    return scores
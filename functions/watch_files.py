@@ -0,0 +1,39 @@
+import os
+import time
+from colorama import Fore
+
+
+def _mtimes(paths):
+    stamps = []
+    for path in paths:
+        try:
+            stamps.append(os.stat(path).st_mtime_ns)
+        except OSError:  # editors may briefly remove the file while saving
+            stamps.append(None)
+    return stamps
+
+
+def watch_files(paths, callback, interval=0.2):
+    """
+    Call callback every time one of paths is saved, until Ctrl+C.
+    Polls modification times every interval seconds; an error raised by
+    callback is printed and watching goes on.
+    """
+    print(Fore.CYAN + f"👀 Watching {', '.join(paths)} (Ctrl+C to stop)")
+    last = _mtimes(paths)
+    try:
+        while True:
+            time.sleep(interval)
+            current = _mtimes(paths)
+            if current == last or None in current:
+                continue
+            last = current
+            started = time.perf_counter()
+            try:
+                callback()
+            except Exception as error:
+                print(Fore.RED + f"✘ {error}")
+                continue
+            print(Fore.GREEN + f"✔ Updated in {(time.perf_counter() - started) * 1000:.0f} ms\n")
+    except KeyboardInterrupt:
+        print(Fore.CYAN + "▶ Stopped watching")
@@ -0,0 +1,24 @@
+from contextlib import contextmanager
+
+# process pool kept running by a long-lived process (functions/daemon.py)
+_warm = {"pool": None}
+
+
+def set_warm_pool(pool):
+    """Use pool (a ProcessPoolExecutor, or None to stop) for every worker_pool() from now on"""
+    _warm["pool"] = pool
+
+
+@contextmanager
+def worker_pool(workers):
+    """
+    Process pool for `workers` processes: the warm pool when one is set
+    (already started, left running on exit), else a new pool shut down
+    on exit.
+    """
+    if _warm["pool"] is not None:
+        yield _warm["pool"]
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield pool
@@ -1,42 +1,46 @@
-import pysrt
+from functions.srt_stream import write_srt
 
-def write_reconciled_srt(output_file, final_subs, summary, mappings, timing_subs):
+def write_reconciled_srt(output_file, final_subs, summary, mappings, timing_cues):
     """
     Write final subtitles to output_file using SRT comment syntax {\\ ... }.
     Appends origin info and original timing text when available.
+    Items are ordered by (start, end) and numbered while writing.
     """
 
-    subs = pysrt.SubRipFile()
-
     # ── Summary pseudo-sub ─────────────────────────────────────
-    note_text = (
-        f"{{\\ Matched (rank)  : {summary.get('matched_rank', 0)}}}\n"
-        f"{{\\ Matched (gap)   : {summary.get('matched_gap', 0)}}}\n"
-        f"{{\\ Matched (spread): {summary.get('matched_spread', 0)}}}\n"
-        f"{{\\ Fallbacks       : {summary.get('fallbacks', 0)}}}"
-    )
-
-    subs.append(pysrt.SubRipItem(
-        index=0,
-        start=pysrt.SubRipTime(0),
-        end=pysrt.SubRipTime(0),
-        text=note_text
-    ))
+    items = [(0, 0, summary_note(summary))]
 
     # ── Real subtitles ──────────────────────────────────────────
-    for sub, mapping in zip(final_subs, mappings):
-        origin = mapping.get("origin", "unknown")
-        comments = [f"{{\\ O ({origin})}}"]
-
+    for (start, end, text), (_, time_idx, _, _, origin) in zip(final_subs, mappings):
         # Add original timing subtitle text if it exists
-        time_idx = mapping.get("time_idx")
-        if time_idx is not None and 0 <= time_idx < len(timing_subs):
-            orig_text = timing_subs[time_idx].text.strip()
-            if orig_text:
-                comments.append(f"{{\\ T: {orig_text}}}")
-
-        sub.text = sub.text + "\n" + "\n".join(comments)
-        subs.append(sub)
-
-    subs.clean_indexes()
-    subs.save(output_file, encoding="utf-8")
+        timing_text = None
+        if time_idx is not None and 0 <= time_idx < len(timing_cues):
+            timing_text = timing_cues.texts[time_idx]
+
+        items.append((start, end, annotate(text, origin, timing_text)))
+
+    # stable sort on exact times, like pysrt's clean_indexes
+    items.sort(key=lambda item: (item[0], item[1]))
+    write_srt(output_file, items)
+
+
+def summary_note(summary):
+    """Text of the summary pseudo-sub written first"""
+    lines = [f"Matched (rank)  : {summary.get('matched_rank', 0)}"]
+    # align line only for engine = align runs, as on the console
+    if summary.get("matched_align"):
+        lines.append(f"Matched (align) : {summary['matched_align']}")
+    lines += [
+        f"Matched (gap)   : {summary.get('matched_gap', 0)}",
+        f"Matched (spread): {summary.get('matched_spread', 0)}",
+        f"Fallbacks       : {summary.get('fallbacks', 0)}",
+    ]
+    return "\n".join(f"{{\\ {line}}}" for line in lines)
+
+
+def annotate(text, origin, timing_text=None):
+    """Subtitle text followed by its origin and original timing text comments"""
+    comments = [f"{{\\ O ({origin})}}"]
+    if timing_text is not None and timing_text.strip():
+        comments.append(f"{{\\ T: {timing_text.strip()}}}")
+    return text + "\n" + "\n".join(comments)
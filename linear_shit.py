@@ -1,7 +1,7 @@
 import configparser
-import pysrt
 from pathlib import Path
 from functions.apply_time_shift import apply_time_shift_linear
+from functions.srt_stream import load_cues, write_srt
 
 def main():
     # ── Load config ────────────────────────────────────────────
@@ -17,16 +17,16 @@ def main():
         raise FileNotFoundError(f"SRT not found: {input_path}")
 
     # ── Load subtitles ─────────────────────────────────────────
-    subs = pysrt.open(str(input_path), encoding="utf-8")
+    cues = load_cues(str(input_path), encoding="utf-8")
 
     # ── Apply linear shift ─────────────────────────────────────
-    apply_time_shift_linear(subs, shift_start_ms, shift_end_ms)
+    apply_time_shift_linear(cues, shift_start_ms, shift_end_ms)
 
     # ── Save output ────────────────────────────────────────────
     output_path = output_path.with_name(
         input_path.stem + "_linear_shifted.srt"
     )
-    subs.save(str(output_path), encoding="utf-8")
+    write_srt(str(output_path), zip(cues.starts, cues.ends, cues.texts), encoding="utf-8")
 
     print(f"✔ Linear shift applied")
     print(f"  start shift: {shift_start_ms} ms")
@@ -1,63 +1,50 @@
+import argparse
 import configparser
-import pysrt
+import cProfile
 from colorama import init, Fore
-from functions.reconcile_rank_fusion import reconcile_rank_fusion
-from functions.apply_time_shift import apply_time_shift_linear
+from functions.reconcile_from_config import reconcile_from_config
+from functions.profiler import Profiler
+from functions.watch_files import watch_files
 # Initialize colorama
 init(autoreset=True)
 
 def main():
-    # ─────────────── Load config ───────────────
-    config = configparser.ConfigParser()
-    config.read("config.ini")  # you can also make this a CLI arg
-
-    # ─────────────── File paths ───────────────
-    text_srt_path = config.get("files", "text_source")
-    timing_srt_path = config.get("files", "timing_source")
-    output_srt_path = config.get("files", "output")
-
-    # ─────────────── Matching parameters ───────────────
-    matching_cfg = config["matching"]
-    time_tolerance_start = matching_cfg.getint("time_tolerance_ms_start")
-    time_tolerance_end = matching_cfg.getint("time_tolerance_ms_end")
-    min_similarity = matching_cfg.getfloat("min_similarity")
-    top_k = matching_cfg.getint("top_k")
-    max_avg_rank = matching_cfg.getfloat("max_avg_rank")
-    max_gap = matching_cfg.getint("max_gap")
-    fallback_to_timing_text = matching_cfg.getboolean("fallback_to_timing_text")
-
-    # ─────────────── Shift ───────────────
-    shift_cfg = config["shift"]
-    shift_start_ms = shift_cfg.getint("shift_start_ms", fallback=0)
-    shift_end_ms = shift_cfg.getint("shift_end_ms", fallback=0)
-
-    # ─────────────── Load subtitles ───────────────
-    print(Fore.CYAN + "▶ Loading SRT files...")
-    text_subs = pysrt.open(text_srt_path, encoding="utf-8")
-    timing_subs = pysrt.open(timing_srt_path, encoding="utf-8")
-    print(Fore.GREEN + f"✔ Loaded {len(text_subs)} text subtitles")
-    print(Fore.GREEN + f"✔ Loaded {len(timing_subs)} timing subtitles\n")
-
-    # Apply global shift if needed
-    if shift_end_ms != 0:
-        apply_time_shift_linear(text_subs, shift_start_ms, shift_end_ms)
-    # if time_offset_ms != 0:
-    #     for sub in timing_subs:
-    #         sub.shift(milliseconds=time_offset_ms)
-    #     print(Fore.YELLOW + f"⚡ Applied time offset of {time_offset_ms} ms\n")
-
-    # ─────────────── Reconcile subtitles ───────────────
-    print(Fore.CYAN + "▶ Reconciling subtitles...")
-    reconcile_rank_fusion(
-        text_source=text_subs,
-        timing_source=timing_subs,
-        output_file=output_srt_path,
-        time_tolerance_start=time_tolerance_start,
-        time_tolerance_end=time_tolerance_end,
-        min_similarity=min_similarity,
-        top_k=top_k,
-        max_avg_rank=max_avg_rank
-    )
+    # ─────────────── Command line ───────────────
+    parser = argparse.ArgumentParser(description="Reconcile a text SRT with a timing SRT")
+    parser.add_argument("--config", default="config.ini", help="path to the config file")
+    parser.add_argument("--workers", type=int, help="processes used to score pairs (overrides config)")
+    parser.add_argument("--profile", metavar="REPORT.json", help="write per-stage time, peak RSS and counters")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="with --profile, trace the peak memory of each stage instead of its time (slow)")
+    parser.add_argument("--cprofile", metavar="OUT.prof", help="also run under cProfile and dump its stats")
+    parser.add_argument("--watch", action="store_true",
+                        help="re-run incrementally whenever an input file or the config is saved")
+    args = parser.parse_args()
+
+    profiler = Profiler(enabled=bool(args.profile), trace_memory=args.profile_memory)
+    if args.cprofile:
+        cprofiler = cProfile.Profile()
+        cprofiler.enable()
+
+    reconcile_from_config(args.config, args.workers, profiler, incremental=args.watch)
+
+    # ─────────────── Profiling output ───────────────
+    if args.cprofile:
+        cprofiler.disable()
+        cprofiler.dump_stats(args.cprofile)
+        print(Fore.CYAN + f"ℹ cProfile stats saved to: {args.cprofile}")
+    if args.profile:
+        profiler.save(args.profile)
+        print(Fore.CYAN + f"ℹ Profile report saved to: {args.profile}")
+
+    # ─────────────── Watch mode ───────────────
+    if args.watch:
+        config = configparser.ConfigParser()
+        config.read(args.config)
+        watch_files(
+            [config.get("files", "text_source"), config.get("files", "timing_source"), args.config],
+            lambda: reconcile_from_config(args.config, args.workers, incremental=True),
+        )
 
 if __name__ == "__main__":
     main()
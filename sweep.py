@@ -0,0 +1,97 @@
+import argparse
+import configparser
+import csv
+import os
+from colorama import init, Fore
+from functions.srt_stream import load_cues
+from functions.apply_time_shift import apply_time_shift_linear
+from functions.text_store import TextStore
+from functions.sweep import SWEEP_KEYS, sweep_grid, run_sweep
+# Initialize colorama
+init(autoreset=True)
+
+# config.ini [matching] key for each sweep parameter
+CONFIG_KEYS = {
+    "time_tolerance_start": ("time_tolerance_ms_start", int),
+    "time_tolerance_end": ("time_tolerance_ms_end", int),
+    "min_similarity": ("min_similarity", float),
+    "top_k": ("top_k", int),
+    "max_avg_rank": ("max_avg_rank", float),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate a grid of matching settings from one scoring pass")
+    parser.add_argument("--config", default="config.ini", help="path to the config file")
+    parser.add_argument("--workers", type=int, help="processes used for scoring and grid points (overrides config)")
+    args = parser.parse_args(argv)
+
+    config = configparser.ConfigParser()
+    config.read(args.config)
+
+    # ─────────────── Grid: [sweep] lists, [matching] values otherwise ───────────────
+    values = {}
+    for key in SWEEP_KEYS:
+        config_key, cast = CONFIG_KEYS[key]
+        raw = config.get("sweep", config_key, fallback=None) or config.get("matching", config_key)
+        values[key] = [cast(v) for v in raw.split(",") if v.strip()]
+    grid = sweep_grid(values)
+
+    scorer = config.get("matching", "scorer", fallback="difflib")
+    anchor_mode = config.get("matching", "anchor_mode", fallback="greedy")
+    workers = args.workers or config.getint("performance", "workers", fallback=1)
+    report_path = config.get("sweep", "report", fallback="")
+    if report_path:
+        # before the grid runs: a missing directory must not lose its results
+        os.makedirs(os.path.dirname(report_path) or ".", exist_ok=True)
+
+    # the grid is scored pairwise over the time window with the rank_fusion engine
+    ignored = [
+        f"{key} = {config.get('matching', key)}"
+        for key, default in (("candidates", "window"), ("scoring", "pairwise"), ("engine", "rank_fusion"))
+        if config.get("matching", key, fallback=default) != default
+    ]
+    if config.getboolean("shift", "auto", fallback=False):
+        ignored.insert(0, "[shift] auto")
+    if ignored:
+        print(Fore.YELLOW + f"⚠ Sweep ignores {', '.join(ignored)} and uses the manual shift, "
+                            "candidates = window, scoring = pairwise, engine = rank_fusion")
+
+    # ─────────────── Load and apply the manual linear shift ───────────────
+    text_subs = load_cues(config.get("files", "text_source"), encoding="utf-8")
+    timing_subs = load_cues(config.get("files", "timing_source"), encoding="utf-8")
+    shift_start_ms = config.getint("shift", "shift_start_ms", fallback=0)
+    shift_end_ms = config.getint("shift", "shift_end_ms", fallback=0)
+    if shift_end_ms != 0:
+        apply_time_shift_linear(text_subs, shift_start_ms, shift_end_ms)
+
+    print(Fore.CYAN + f"▶ Sweeping {len(grid)} settings...")
+    results = run_sweep(
+        text_subs,
+        timing_subs,
+        grid,
+        TextStore.from_cues(text_subs),
+        TextStore.from_cues(timing_subs),
+        scorer=scorer,
+        workers=workers,
+        anchor_mode=anchor_mode,
+    )
+
+    # ─────────────── Report ───────────────
+    columns = list(SWEEP_KEYS) + ["matched_rank", "matched_gap", "matched_spread", "fallbacks"]
+    rows = [{**params, **summary} for params, summary in results]
+
+    print(Fore.CYAN + "  ".join(f"{name:>10.10}" for name in columns))
+    for row in rows:
+        print("  ".join(f"{row[name]:>10}" for name in columns))
+
+    if report_path:
+        with open(report_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        print(Fore.GREEN + f"✔ Sweep report saved to: {report_path}")
+
+
+if __name__ == "__main__":
+    main()